@@ -1,14 +1,738 @@
+import bisect
+import functools
+import operator
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+# Elements handled per block when scanning an array, so large and
+# memory-mapped arrays never need a full-size temporary.
+BLOCK_ELEMENTS = 1 << 22
+
+# Threads used for blocked reductions.
+AGGREGATE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Histogram bins per pass when narrowing down a quantile.
+SELECT_BINS = 4096
+
+# Values gathered into memory for the final partition of an exact quantile.
+SELECT_MAX_CANDIDATES = 1 << 20
+
+# File extensions read as raw little-endian binary.
+RAW_EXTENSIONS = (".bin", ".raw", ".dat")
+
+
+def map_array(path, dtype=None, shape=None, mode="r", offset=0):
+    """Open a .npy or raw binary file as a memory-mapped array.
+
+    ``mode`` is as for ``np.memmap``: "r" read-only, "r+" read/write, "c"
+    copy-on-write, "w+" create (needs ``dtype`` and ``shape``). Raw files
+    are little-endian and need a ``dtype``; without ``shape`` they map as
+    1D over the whole file.
+    """
+    if path.endswith(".npy"):
+        if mode == "w+":
+            return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        return np.load(path, mmap_mode=mode)
+
+    if dtype is None:
+        raise ValueError("Raw binary files need a dtype.")
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if shape is None and mode != "w+":
+        shape = ((os.path.getsize(path) - offset) // dtype.itemsize,)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+
+def load_array(path, dtype=None, shape=None, key=None, skiprows=0):
+    """Read a whole array from a file in one bulk call.
+
+    - ``.npy`` / ``.npz``: NumPy's own formats (``key`` picks the array in
+      an ``.npz``; default is the first).
+    - ``.csv``: comma separated text; other text files are whitespace
+      separated. ``skiprows`` skips header lines.
+    - ``.bin`` / ``.raw`` / ``.dat``: raw little-endian values; needs ``dtype``.
+
+    ``dtype`` (int8 to int64, uint8 to uint64, float32, float64) converts
+    the result; ``shape`` reshapes it.
+    """
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "iuf":
+            raise ValueError(f"Unsupported dtype {dtype}; use an integer or float type.")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        array = np.load(path)
+    elif extension == ".npz":
+        with np.load(path) as archive:
+            array = archive[key if key is not None else archive.files[0]]
+    elif extension in RAW_EXTENSIONS:
+        if dtype is None:
+            raise ValueError("Raw binary files need a dtype.")
+        array = np.fromfile(path, dtype=dtype.newbyteorder("<"))
+    else:
+        delimiter = "," if extension == ".csv" else None
+        array = np.loadtxt(path, dtype=dtype or np.float64, delimiter=delimiter,
+                           skiprows=skiprows, ndmin=1)
+
+    if dtype is not None and array.dtype != dtype:
+        array = array.astype(dtype)
+    return array.reshape(shape) if shape is not None else array
+
+
+def _parse_shape(text):
+    text = text.strip()
+    return tuple(int(n) for n in text.split(",")) if text else None
+
+
+def _flat_blocks(array, block=BLOCK_ELEMENTS):
+    """Yield ``(offset, view)`` over the elements of ``array`` in C order."""
+    if isinstance(array, ChunkedArray):
+        offset = 0
+        for chunk in array.chunks:
+            for start, view in _flat_blocks(chunk, block):
+                yield offset + start, view
+            offset += chunk.size
+        return
+    flat = array.reshape(-1)
+    for start in range(0, flat.size, block):
+        yield start, flat[start:start + block]
+
+
+def _scan_positions(array, test):
+    hits = [np.flatnonzero(test(block)) + start for start, block in _flat_blocks(array)]
+    flat = np.concatenate(hits) if hits else np.empty(0, dtype=np.intp)
+    return np.unravel_index(flat, array.shape)
+
+
+def find_positions(array, value):
+    """Same result as ``np.where(array == value)``, scanning block by block."""
+    return _scan_positions(array, lambda block: block == value)
+
+
+def find_between(array, low, high):
+    """Same result as ``np.where((array >= low) & (array <= high))``, block by block."""
+    return _scan_positions(array, lambda block: (block >= low) & (block <= high))
+
+
+def find_largest(array, k):
+    """The ``k`` largest values, largest first, and their positions, block by block."""
+    if k <= 0:
+        return np.empty(0, dtype=array.dtype), np.unravel_index(np.empty(0, dtype=np.intp), array.shape)
+    values = []
+    positions = []
+    for start, block in _flat_blocks(array):
+        kept = None
+        if block.dtype.kind == "f" and np.isnan(block).any():
+            kept = np.flatnonzero(~np.isnan(block))
+            block = block[kept]
+        top = np.argpartition(block, -k)[-k:] if k < block.size else np.arange(block.size)
+        values.append(block[top])
+        positions.append((top if kept is None else kept[top]) + start)
+    values = np.concatenate(values) if values else np.empty(0, dtype=array.dtype)
+    positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+    top = np.argsort(values, kind="stable")[::-1][:k]
+    return values[top], np.unravel_index(positions[top], array.shape)
+
+
+def filter_greater(array, threshold):
+    """Same result as ``array[array > threshold]``, scanning block by block."""
+    parts = [block[block > threshold] for _, block in _flat_blocks(array)]
+    return np.concatenate(parts) if parts else np.empty(0, dtype=array.dtype)
+
+
+class SortedIndex:
+    """Stable argsort of an array's elements, answering lookups by binary search.
+
+    Building costs one sort plus a position and a sorted copy per element;
+    after that equality, range and top-k lookups are ``searchsorted`` calls
+    (O(log n) plus the size of the answer). Positions are returned like
+    ``np.where``: per-axis index arrays in C order.
+    """
+
+    def __init__(self, array):
+        self.shape = array.shape
+        flat = array.reshape(-1)
+        self.order = np.argsort(flat, kind="stable")
+        self.values = flat[self.order]
+        # NaNs sort last and never match a lookup.
+        self.valid = int(np.searchsorted(self.values, np.nan)) if flat.dtype.kind == "f" else flat.size
+
+    def _positions(self, start, end):
+        return np.unravel_index(np.sort(self.order[start:end]), self.shape)
+
+    def _span(self, low, high):
+        sorted_values = self.values[:self.valid]
+        return (np.searchsorted(sorted_values, low, side="left"),
+                np.searchsorted(sorted_values, high, side="right"))
+
+    def find(self, value):
+        """Positions equal to ``value``, like ``np.where(array == value)``."""
+        return self._positions(*self._span(value, value))
+
+    def find_many(self, values):
+        """``find`` for each of ``values``, with one vectorised search."""
+        starts, ends = self._span(np.asarray(values), np.asarray(values))
+        return [self._positions(start, end) for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def count_many(self, values):
+        """How often each of ``values`` occurs."""
+        starts, ends = self._span(np.asarray(values), np.asarray(values))
+        return ends - starts
+
+    def between(self, low, high):
+        """Positions of values in ``[low, high]``."""
+        return self._positions(*self._span(low, high))
+
+    def greater(self, threshold):
+        """Values above ``threshold`` in C order, like ``array[array > threshold]``."""
+        start = np.searchsorted(self.values[:self.valid], threshold, side="right")
+        picked = np.argsort(self.order[start:self.valid], kind="stable")
+        return self.values[start:self.valid][picked]
+
+    def largest(self, k):
+        """The ``k`` largest values, largest first, and their positions."""
+        start = max(self.valid - k, 0)
+        return (self.values[start:self.valid][::-1],
+                np.unravel_index(self.order[start:self.valid][::-1], self.shape))
+
+    def sorted(self):
+        """All values in order, like ``np.sort(array, axis=None)``."""
+        return self.values
+
+
+class ChunkedArray:
+    """Arrays stacked along axis 0 without copying them.
+
+    Chunks are kept as given (views, memory maps) and joined only by
+    ``materialize()``, so appending costs only the new rows. Row indexing
+    and slicing return views or ``ChunkedArray``s of views, arithmetic
+    works chunk by chunk, and the blocked helpers (``moments``,
+    ``quantile``, ``find_positions``, ...) accept one directly.
+    """
+
+    # Makes NumPy hand ``ndarray + ChunkedArray`` to ``__radd__`` and friends.
+    __array_ufunc__ = None
+
+    def __init__(self, chunks=()):
+        self.chunks = []
+        # Row offset where each chunk starts, plus the total.
+        self._starts = [0]
+        for chunk in chunks:
+            self.append(chunk)
+
+    def append(self, chunk):
+        if self.chunks and chunk.shape[1:] != self.chunks[0].shape[1:]:
+            raise ValueError(f"Rows of shape {chunk.shape[1:]} do not match {self.chunks[0].shape[1:]}.")
+        self.chunks.append(chunk)
+        self._starts.append(self._starts[-1] + len(chunk))
+        return self
+
+    @property
+    def shape(self):
+        rest = self.chunks[0].shape[1:] if self.chunks else ()
+        return (self._starts[-1],) + rest
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return sum(chunk.size for chunk in self.chunks)
+
+    @property
+    def dtype(self):
+        return np.result_type(*{chunk.dtype for chunk in self.chunks}) if self.chunks else np.dtype(float)
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def materialize(self):
+        """Concatenate the chunks into one new array."""
+        if not self.chunks:
+            return np.empty(self.shape)
+        return np.concatenate(self.chunks)
+
+    def _locate(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError(f"index {row} is out of bounds for axis 0 with size {len(self)}")
+        row %= len(self)
+        i = bisect.bisect_right(self._starts, row) - 1
+        return self.chunks[i], row - self._starts[i]
+
+    def _slice_rows(self, rows):
+        """``ChunkedArray`` of the rows ``range(len(self))[rows]``, as chunk views."""
+        selected = range(len(self))[rows]
+        step = selected.step
+        pieces = []
+        order = range(len(self.chunks)) if step > 0 else reversed(range(len(self.chunks)))
+        for i in order:
+            start, end = self._starts[i], self._starts[i + 1]
+            # Positions in ``selected`` of the rows that fall in this chunk.
+            if step > 0:
+                first = max(0, -(-(start - selected.start) // step))
+                last = min(len(selected), -(-(end - selected.start) // step))
+            else:
+                first = max(0, -(-(selected.start - end + 1) // -step))
+                last = min(len(selected), (selected.start - start) // -step + 1)
+            if first < last:
+                part = selected[first:last]
+                stop = part.stop - start
+                pieces.append(self.chunks[i][part.start - start:stop if stop >= 0 else None:step])
+        if not pieces and self.chunks:
+            # An empty view keeps the row shape and dtype.
+            pieces.append(self.chunks[0][:0])
+        return ChunkedArray(pieces)
+
+    def __getitem__(self, key):
+        rest = ()
+        if isinstance(key, tuple):
+            key, rest = (key[0], key[1:]) if key else (slice(None), ())
+        if isinstance(key, (int, np.integer)):
+            chunk, row = self._locate(int(key))
+            return chunk[(row,) + rest]
+        if isinstance(key, slice):
+            sliced = self._slice_rows(key)
+            if rest:
+                sliced = ChunkedArray(chunk[(slice(None),) + rest] for chunk in sliced.chunks)
+            return sliced
+        # Row lists and boolean masks copy just the rows they pick.
+        rows = np.asarray(key)
+        if rows.dtype == bool:
+            if rows.shape != (len(self),):
+                raise IndexError(f"boolean index of shape {rows.shape} does not match {len(self)} rows")
+            rows = np.flatnonzero(rows)
+        elif rows.dtype.kind not in "iu" and rows.size:
+            raise IndexError("arrays used as indices must be of integer (or boolean) type")
+        rows = rows.astype(np.intp)
+        outside = (rows < -len(self)) | (rows >= len(self))
+        if outside.any():
+            raise IndexError(f"index {rows[outside][0]} is out of bounds for axis 0 with size {len(self)}")
+        rows[rows < 0] += len(self)
+
+        # Group the wanted rows by chunk and fancy-index each chunk once.
+        owner = np.searchsorted(self._starts, rows, side="right") - 1
+        order = np.argsort(owner, kind="stable")
+        bounds = np.searchsorted(owner[order], np.arange(len(self.chunks) + 1))
+        gathered = np.empty((len(rows),) + self.shape[1:], dtype=self.dtype)
+        for i, chunk in enumerate(self.chunks):
+            picked = order[bounds[i]:bounds[i + 1]]
+            if len(picked):
+                gathered[picked] = chunk[rows[picked] - self._starts[i]]
+        return gathered[(slice(None),) + rest]
+
+    def _elementwise(self, op, other, reverse=False):
+        pieces = []
+        for i, chunk in enumerate(self.chunks):
+            part = other
+            if isinstance(other, ChunkedArray):
+                part = other[self._starts[i]:self._starts[i + 1]].materialize()
+            elif isinstance(other, np.ndarray) and other.ndim == self.ndim and len(other) == len(self):
+                part = other[self._starts[i]:self._starts[i + 1]]
+            pieces.append(op(part, chunk) if reverse else op(chunk, part))
+        return ChunkedArray(pieces)
+
+    def __add__(self, other):
+        return self._elementwise(operator.add, other)
+
+    def __radd__(self, other):
+        return self._elementwise(operator.add, other, reverse=True)
+
+    def __sub__(self, other):
+        return self._elementwise(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._elementwise(operator.sub, other, reverse=True)
+
+    def __mul__(self, other):
+        return self._elementwise(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self._elementwise(operator.mul, other, reverse=True)
+
+    def __truediv__(self, other):
+        return self._elementwise(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self._elementwise(operator.truediv, other, reverse=True)
+
+    def __str__(self):
+        if self.size <= np.get_printoptions()["threshold"]:
+            return str(self.materialize())
+        return repr(self)
+
+    def __repr__(self):
+        return f"ChunkedArray({len(self.chunks)} chunks, shape={self.shape}, dtype={self.dtype})"
+
+
+def _slabs(array, axis=0, block=BLOCK_ELEMENTS):
+    """Yield views of ``array`` cut along ``axis``, each about ``block`` elements."""
+    lane = array.size // array.shape[axis] if array.shape[axis] else 1
+    step = max(1, block // max(lane, 1))
+    for start in range(0, array.shape[axis], step):
+        index = [slice(None)] * array.ndim
+        index[axis] = slice(start, start + step)
+        slab = array[tuple(index)]
+        # A slab spanning chunks is copied; it is at most about ``block`` elements.
+        yield slab.materialize() if isinstance(slab, ChunkedArray) else slab
+
+
+def split_rows(array, parts):
+    """Split along axis 0 like ``np.array_split``; the parts are views."""
+    if parts <= 0:
+        raise ValueError("number sections must be larger than 0.")
+    size, extra = divmod(len(array), parts)
+    bounds = np.cumsum([0] + [size + 1] * extra + [size] * (parts - extra))
+    return [array[start:end] for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+
+
+def _map_blocks(func, blocks, workers):
+    """``map(func, blocks)`` on a thread pool; NumPy releases the GIL while reducing."""
+    if workers <= 1:
+        yield from map(func, blocks)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, blocks)
+
+
+def _check_axis(array, axis):
+    if axis is None:
+        return None
+    if not -array.ndim <= axis < array.ndim:
+        raise ValueError(f"axis {axis} is out of range for a {array.ndim}D array")
+    return axis % array.ndim
+
+
+def _block_moments(block, axis=None):
+    count = block.size if axis is None else block.shape[axis]
+    total = block.sum(axis=axis)
+    # Integer sums can wrap; the mean and M2 are taken in float64, as np.mean does.
+    mean = (total if block.dtype.kind == "f" else block.sum(axis=axis, dtype=np.float64)) / count
+    centred = block - (mean if axis is None else np.expand_dims(mean, axis))
+    return count, total, mean, np.square(centred).sum(axis=axis)
+
+
+def _merge_moments(left, right):
+    """Chan et al.'s parallel form of Welford's update for two partial results."""
+    count_a, total_a, mean_a, m2_a = left
+    count_b, total_b, mean_b, m2_b = right
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    return (count, total_a + total_b, mean_a + delta * count_b / count,
+            m2_a + m2_b + delta ** 2 * count_a * count_b / count)
+
+
+def moments(array, axis=None, workers=AGGREGATE_WORKERS):
+    """Sum, mean, variance and standard deviation in one blocked pass.
+
+    The array is cut into blocks of about ``BLOCK_ELEMENTS`` that are
+    reduced on a thread pool and merged with ``_merge_moments``, so no
+    temporary larger than one block is made and memory-mapped data is read
+    once. With ``axis`` each result is an array, as for ``np.sum(array, axis)``.
+    """
+    axis = _check_axis(array, axis)
+    if array.size == 0:
+        if isinstance(array, ChunkedArray):
+            array = array.materialize()
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            var = np.var(array, axis=axis)
+            return {"sum": np.sum(array, axis=axis), "mean": np.mean(array, axis=axis),
+                    "var": var, "std": np.sqrt(var)}
+
+    if axis is None or array.ndim == 1:
+        parts = _map_blocks(_block_moments, (block for _, block in _flat_blocks(array)), workers)
+    else:
+        parts = _map_blocks(functools.partial(_block_moments, axis=axis), _slabs(array), workers)
+
+    if axis in (None, 0):
+        count, total, mean, m2 = functools.reduce(_merge_moments, parts)
+    else:
+        # Slabs along axis 0 each hold complete lanes, so their results just stack.
+        parts = list(parts)
+        count = parts[0][0]
+        total, mean, m2 = (np.concatenate([part[i] for part in parts]) for i in (1, 2, 3))
+    var = m2 / count
+    return {"sum": total, "mean": mean, "var": var, "std": np.sqrt(var)}
+
+
+def _sort_keys(block):
+    """int64 keys that sort like the values; floats use their bit patterns."""
+    if block.dtype.kind == "u" and block.dtype.itemsize == 8:
+        # Flipping the top bit moves uint64 values above 2**63 past the rest.
+        return block.view(np.uint64).view(np.int64) ^ np.int64(-2 ** 63)
+    if block.dtype.kind != "f":
+        return block.astype(np.int64, copy=False)
+    # Adding 0.0 turns -0.0 into 0.0, so equal values get equal keys.
+    bits = (np.asarray(block, dtype=np.float64) + 0.0).view(np.int64)
+    # Flipping all but the sign bit of negatives makes the order numeric.
+    return bits ^ ((bits >> 63) & np.int64(0x7FFFFFFFFFFFFFFF))
+
+
+def _from_key(key, dtype):
+    if dtype.kind == "u" and dtype.itemsize == 8:
+        return dtype.type(key + 2 ** 63)
+    if dtype.kind != "f":
+        return dtype.type(key)
+    bits = np.array([key], dtype=np.int64)
+    return dtype.type(_sort_keys(bits.view(np.float64)).view(np.float64)[0])
+
+
+def _key_counts(block, low, high, shift):
+    keys = _sort_keys(block)
+    keys = keys[(keys >= low) & (keys <= high)]
+    # Differences can exceed int64 but always fit in uint64.
+    offsets = (keys - np.int64(low)).view(np.uint64) >> np.uint64(shift)
+    return np.bincount(offsets.astype(np.intp), minlength=SELECT_BINS)
+
+
+def _key_gather(block, low, high):
+    keys = _sort_keys(block)
+    return block[(keys >= low) & (keys <= high)]
+
+
+def _select(array, rank, low, high, workers):
+    """Elements at sorted positions ``rank`` and ``rank + 1``, without sorting ``array``.
+
+    Values are binned by their sort keys. Each pass counts the keys left
+    in ``SELECT_BINS`` bins and keeps only the bin holding ``rank``; once it
+    has at most ``SELECT_MAX_CANDIDATES`` values they are gathered and
+    ``np.partition`` picks the answer. The second value is ``None`` when it
+    lies outside the gathered bin.
+    """
+    blocks = lambda: (block for _, block in _flat_blocks(array))
+    low, high = (int(_sort_keys(np.array([v], dtype=array.dtype))[0]) for v in (low, high))
+    below = 0
+    while True:
+        shift = max(0, (high - low).bit_length() - SELECT_BINS.bit_length() + 1)
+        counts = sum(_map_blocks(functools.partial(_key_counts, low=low, high=high, shift=shift),
+                                 blocks(), workers))
+        cumulative = np.cumsum(counts)
+        b = int(np.searchsorted(cumulative, rank - below, side="right"))
+        below += int(cumulative[b - 1]) if b else 0
+        low, high = low + (b << shift), min(high, low + ((b + 1) << shift) - 1)
+        position = rank - below
+
+        if low == high:
+            # Every value left is the same.
+            value = _from_key(low, array.dtype)
+            return value, value if position + 1 < counts[b] else None
+        if counts[b] <= SELECT_MAX_CANDIDATES:
+            break
+
+    candidates = np.concatenate(list(_map_blocks(
+        functools.partial(_key_gather, low=low, high=high), blocks(), workers)))
+    if position + 1 < candidates.size:
+        candidates = np.partition(candidates, [position, position + 1])
+        return candidates[position], candidates[position + 1]
+    return np.partition(candidates, position)[position], None
+
+
+def _linear_counts(block, low, scale):
+    values = np.asarray(block, dtype=np.float64)
+    # Infinities land in the first and last bins, in order with the rest.
+    bins = np.clip((values - low) * scale, 0, SELECT_BINS - 1).astype(np.intp)
+    return np.bincount(bins, minlength=SELECT_BINS)
+
+
+def _approximate(array, ranks, low, high, workers):
+    """Estimates of the elements at sorted ``ranks`` from one histogram pass over ``[low, high]``.
+
+    Returns the midpoints of the bins holding each rank and the most any of
+    them can be off: half a bin width, plus a few ulps for rounding.
+    """
+    low, high = float(low), float(high)
+    width = (high - low) / SELECT_BINS
+    if width == 0 or not np.isfinite(width):
+        return [(low + high) / 2] * len(ranks), (high - low) / 2
+    counts = sum(_map_blocks(functools.partial(_linear_counts, low=low, scale=1 / width),
+                             (block for _, block in _flat_blocks(array)), workers))
+    bins = np.searchsorted(np.cumsum(counts), ranks, side="right")
+    error = width / 2 + 4 * np.spacing(max(abs(low), abs(high)))
+    return [low + (b + 0.5) * width for b in bins], error
+
+
+def _count_and_next(block, value):
+    larger = block[block > value]
+    return block.size - larger.size, larger.min() if larger.size else None
+
+
+def _next_value(array, value, rank, workers):
+    """Element at sorted position ``rank + 1`` given ``value`` is the one at ``rank``."""
+    not_above = 0
+    following = None
+    for count, smallest in _map_blocks(functools.partial(_count_and_next, value=value),
+                                       (block for _, block in _flat_blocks(array)), workers):
+        not_above += count
+        if smallest is not None:
+            following = smallest if following is None else min(following, smallest)
+    return value if not_above > rank + 1 else following
+
+
+def _lerp(a, b, t):
+    # Same interpolation as np.quantile's default "linear" method.
+    return b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
+
+
+def _block_range(block):
+    """Min and max of the finite values (``None`` if there are none) and the numbers of -inf and +inf.
+
+    The bounds are NaN when the block holds a NaN.
+    """
+    low, high = block.min(), block.max()
+    if block.dtype.kind != "f" or np.isfinite(low) and np.isfinite(high) or np.isnan(low):
+        return low, high, 0, 0
+    finite = block[np.isfinite(block)]
+    negative = int(np.count_nonzero(block == -np.inf))
+    bounds = (finite.min(), finite.max()) if finite.size else (None, None)
+    return (*bounds, negative, block.size - finite.size - negative)
+
+
+def _neighbours(array, q, exact, workers):
+    """Elements at the sorted positions around ``q * (array.size - 1)``.
+
+    Returns ``(values, fraction, error)``: one value, or the two either side
+    of the position when its ``fraction`` is nonzero. Infinities are counted
+    apart, so positions among them are answered directly and the search
+    spans only the finite values. ``values`` is ``[nan]`` when the array
+    holds a NaN.
+    """
+    parts = list(_map_blocks(_block_range, (block for _, block in _flat_blocks(array)), workers))
+    if any(low is not None and np.isnan(low) for low, _, _, _ in parts):
+        return [np.nan], 0.0, 0.0
+    lows = [low for low, _, _, _ in parts if low is not None]
+    highs = [high for _, high, _, _ in parts if high is not None]
+    low, high = (np.min(lows), np.max(highs)) if lows else (None, None)
+    negative = sum(part[2] for part in parts)
+    positive = sum(part[3] for part in parts)
+
+    rank = q * (array.size - 1)
+    below = int(np.floor(rank))
+    fraction = rank - below
+    wanted = [below, below + 1] if fraction else [below]
+    values = [-np.inf if r < negative else np.inf if r >= array.size - positive else None for r in wanted]
+    search = [r for r, value in zip(wanted, values) if value is None]
+    if not search:
+        return values, fraction, 0.0
+
+    error = 0.0
+    if not exact:
+        found, error = _approximate(array, search, low, high, workers)
+    else:
+        found = list(_select(array, search[0] - negative, low, high, workers))
+        if len(search) == 2 and found[1] is None:
+            found[1] = _next_value(array, found[0], below, workers)
+    found = iter(found)
+    return [next(found) if value is None else value for value in values], fraction, error
+
+
+def quantile(array, q, axis=None, exact=True, workers=AGGREGATE_WORKERS):
+    """The ``q``-th quantile, interpolated like ``np.quantile``, without a full sort.
+
+    Whole-array quantiles narrow down the wanted rank with blocked histogram
+    passes and partition only the few values left (see ``_select``), so the
+    array is never copied. With ``exact=False`` a single histogram pass is
+    made and a bin midpoint returned. With ``axis``, slabs that keep whole
+    lanes are handed to ``np.quantile`` (partition based) one at a time.
+    At a whole position or between two equal values the element itself is
+    returned, where ``np.quantile`` gives NaN if it is infinite.
+
+    Returns ``(value, error)``: ``value`` is within ``error`` of the true
+    quantile, and ``error`` is 0 for exact results.
+    """
+    if not 0 <= q <= 1:
+        raise ValueError("Quantiles must be between 0 and 1.")
+    axis = _check_axis(array, axis)
+    if axis is not None and array.ndim > 1:
+        keep = 1 if axis == 0 else 0
+        parts = _map_blocks(functools.partial(np.quantile, q=q, axis=axis),
+                            _slabs(array, keep), workers)
+        return np.concatenate(list(parts)), 0.0
+    if array.size == 0:
+        return np.nan, 0.0
+
+    values, fraction, error = _neighbours(array, q, exact, workers)
+    if not fraction:
+        return np.float64(values[0]), error
+    # Interpolating in the array's own dtype, as np.quantile does, keeps
+    # integer differences exact.
+    a, b = values
+    with np.errstate(invalid="ignore", over="ignore"):
+        return np.float64(a if a == b else _lerp(a, b, fraction)), error
+
+
+def median(array, axis=None, exact=True, workers=AGGREGATE_WORKERS):
+    """The median as ``np.median`` gives it, found like ``quantile(array, 0.5)``.
+
+    With an even number of elements it is the mean of the two middle ones,
+    not the interpolation ``quantile`` uses; the two differ for infinities
+    and near the float64 limits.
+    """
+    axis = _check_axis(array, axis)
+    if axis is not None and array.ndim > 1:
+        keep = 1 if axis == 0 else 0
+        parts = _map_blocks(functools.partial(np.median, axis=axis), _slabs(array, keep), workers)
+        return np.concatenate(list(parts)), 0.0
+    if array.size == 0:
+        return np.nan, 0.0
+
+    values, _, error = _neighbours(array, 0.5, exact, workers)
+    dtype = array.dtype if array.dtype.kind == "f" else np.float64
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.mean(np.array(values, dtype=dtype)), error
+
+
 class DataAnalytics:
-    def __init__(self):
+    def __init__(self, use_index=True):
         self.array = None
+        # File behind ``self.array`` when it is memory-mapped.
+        self.path = None
+        # Answer searches from a ``SortedIndex`` built on first use.
+        self.use_index = use_index
+
+    @property
+    def array(self):
+        return self._array
+
+    @array.setter
+    def array(self, value):
+        self._array = value
+        self._index = None
+
+    def search_index(self):
+        """``SortedIndex`` of ``self.array``, built on first use.
+
+        ``None`` when indexing is off or the array is memory-mapped or
+        chunked: the index would hold the whole array in memory, so those
+        are scanned.
+        """
+        if not self.use_index or isinstance(self.array, (np.memmap, ChunkedArray)):
+            return None
+        if self._index is None:
+            self._index = SortedIndex(self.array)
+        return self._index
+
+    def open_array(self, path, dtype=None, shape=None, mode="r"):
+        """Point ``self.array`` at a memory-mapped file instead of loading it."""
+        try:
+            self.array = map_array(path, dtype, shape, mode)
+        except (OSError, ValueError, TypeError) as e:
+            print("Could not open file:", e)
+            return False
+        self.path = path
+        print(f"Mapped {path}: shape {self.array.shape}, dtype {self.array.dtype}")
+        return True
 
     def create_array(self):
         print("\nSelect the type of array to create:")
         print("1. 1D Array")
         print("2. 2D Array")
         print("3. 3D Array")
+        print("4. Memory-mapped file (.npy or raw binary)")
+        print("5. Load from file (CSV, text, .npy/.npz, raw binary)")
         choice = int(input("Enter your choice: "))
 
         if choice == 1:
@@ -28,10 +752,35 @@ class DataAnalytics:
             z = int(input("Enter number of columns: "))
             elements = list(map(int, input(f"Enter {x*y*z} elements separated by space: ").split()))
             self.array = np.array(elements, dtype=int).reshape(x, y, z)
+
+        elif choice == 4:
+            path = input("Enter file path: ")
+            dtype = shape = None
+            if not path.endswith(".npy"):
+                dtype = input("Enter dtype (e.g. int32, float64): ")
+                shape = _parse_shape(input("Enter shape (comma separated, blank for 1D): "))
+            if not self.open_array(path, dtype, shape):
+                return
+
+        elif choice == 5:
+            path = input("Enter file path: ")
+            dtype = input("Enter dtype (e.g. int32, float64; blank to keep the file's): ").strip() or None
+            shape = _parse_shape(input("Enter shape (comma separated, blank to keep): "))
+            skiprows = 0
+            if os.path.splitext(path)[1].lower() not in (".npy", ".npz") + RAW_EXTENSIONS:
+                skiprows = int(input("Enter number of header lines to skip: ") or 0)
+            try:
+                self.array = load_array(path, dtype, shape, skiprows=skiprows)
+            except (OSError, ValueError, TypeError, KeyError) as e:
+                print("Could not load file:", e)
+                return
         else:
             print("Invalid choice!")
             return
 
+        if choice != 4:
+            self.path = None
+
         print("\nArray created successfully:")
         print(self.array)
 
@@ -79,17 +828,24 @@ class DataAnalytics:
         if choice == 1:
             elements = list(map(int, input("Enter elements of another array separated by space: ").split()))
             try:
-                new_array = np.array(elements, dtype=int).reshape(self.array.shape)
-                combined = np.vstack((self.array, new_array))
+                # Rows stack as in np.vstack, but chunks are only referenced, not copied.
+                combined = self.array
+                if not isinstance(combined, ChunkedArray):
+                    combined = ChunkedArray([np.atleast_2d(combined)])
+                new_array = np.array(elements, dtype=int).reshape((-1,) + combined.shape[1:])
+                combined = ChunkedArray(combined.chunks).append(new_array)
                 print("\nCombined Array (Vertical Stack):")
                 print(combined)
-            except:
+            except ValueError:
                 print("Shape mismatch! Cannot combine arrays.")
+                return
+            if input("Keep the combined array? (y/n): ").strip().lower() == "y":
+                self.array = combined
 
         elif choice == 2:
             parts = int(input("Enter number of parts to split: "))
             try:
-                split_arrays = np.array_split(self.array, parts)
+                split_arrays = split_rows(self.array, parts)
                 print("\nSplit Arrays:")
                 for arr in split_arrays:
                     print(arr)
@@ -138,22 +894,50 @@ class DataAnalytics:
         print("1. Search a value")
         print("2. Sort the array")
         print("3. Filter values")
+        print("4. Search several values")
+        print("5. Find values in a range")
+        print("6. Largest values (top-k)")
         choice = int(input("Enter your choice: "))
+        index = self.search_index() if 1 <= choice <= 6 else None
 
         if choice == 1:
             val = int(input("Enter value to search: "))
-            indices = np.where(self.array == val)
+            indices = index.find(val) if index else find_positions(self.array, val)
             print("Value found at positions:", indices)
 
         elif choice == 2:
-            sorted_arr = np.sort(self.array, axis=None).reshape(self.array.shape)
+            if index:
+                sorted_values = index.sorted()
+            elif isinstance(self.array, ChunkedArray):
+                sorted_values = np.sort(self.array.materialize(), axis=None)
+            else:
+                sorted_values = np.sort(self.array, axis=None)
+            sorted_arr = sorted_values.reshape(self.array.shape)
             print("\nSorted Array:\n", sorted_arr)
 
         elif choice == 3:
             condition = int(input("Show values greater than: "))
-            filtered = self.array[self.array > condition]
+            filtered = index.greater(condition) if index else filter_greater(self.array, condition)
             print("\nFiltered Array:\n", filtered)
 
+        elif choice == 4:
+            values = list(map(int, input("Enter values separated by space: ").split()))
+            found = index.find_many(values) if index else [find_positions(self.array, v) for v in values]
+            for val, indices in zip(values, found):
+                print(f"{val}: found at positions:", indices)
+
+        elif choice == 5:
+            low = int(input("Enter lower bound: "))
+            high = int(input("Enter upper bound: "))
+            indices = index.between(low, high) if index else find_between(self.array, low, high)
+            print(f"Values in [{low}, {high}] at positions:", indices)
+
+        elif choice == 6:
+            k = int(input("How many largest values: "))
+            values, indices = index.largest(k) if index else find_largest(self.array, k)
+            print("Largest values:", values)
+            print("At positions:", indices)
+
     
     
     def aggregate_statistics(self):
@@ -167,20 +951,37 @@ class DataAnalytics:
         print("3. Median")
         print("4. Standard Deviation")
         print("5. Variance")
+        print("6. Quantile")
+        print("7. Approximate Median (with error bound)")
         choice = int(input("Enter your choice: "))
-
-        if choice == 1:
-            print("Sum of Array:", np.sum(self.array))
-        elif choice == 2:
-            print("Mean of Array:", np.mean(self.array))
-        elif choice == 3:
-            print("Median of Array:", np.median(self.array))
-        elif choice == 4:
-            print("Standard Deviation:", np.std(self.array))
-        elif choice == 5:
-            print("Variance:", np.var(self.array))
-        else:
+        if not 1 <= choice <= 7:
             print("Invalid choice!")
+            return
+
+        axis = None
+        if self.array.ndim > 1 and choice != 7:
+            text = input("Enter axis (blank for the whole array): ").strip()
+            axis = int(text) if text else None
+
+        try:
+            if choice == 1:
+                print("Sum of Array:", moments(self.array, axis)["sum"])
+            elif choice == 2:
+                print("Mean of Array:", moments(self.array, axis)["mean"])
+            elif choice == 3:
+                print("Median of Array:", median(self.array, axis)[0])
+            elif choice == 4:
+                print("Standard Deviation:", moments(self.array, axis)["std"])
+            elif choice == 5:
+                print("Variance:", moments(self.array, axis)["var"])
+            elif choice == 6:
+                q = float(input("Enter quantile (0 to 1): "))
+                print(f"{q:g} Quantile:", quantile(self.array, q, axis)[0])
+            elif choice == 7:
+                value, error = median(self.array, exact=False)
+                print(f"Approximate Median: {value} (within {error:g})")
+        except ValueError as e:
+            print("Error:", e)
 
 def main():
     analyzer = DataAnalytics()
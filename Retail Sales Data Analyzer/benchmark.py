@@ -0,0 +1,186 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Optional
+
+import matplotlib
+import pandas as pd
+
+matplotlib.use("Agg")
+
+from generate_data import generate_sales_csv, parse_rows
+from op import RetailAnalyzer
+
+# Relative slowdown (or RSS growth) tolerated before a result counts as a regression.
+DEFAULT_TOLERANCE = 0.25
+
+# Timings shorter than this are too noisy to flag as regressions.
+MIN_COMPARABLE_SECONDS = 0.05
+
+# RSS growth below this many MB is allocator noise, not a regression.
+MIN_COMPARABLE_MB = 16.0
+
+
+def _current_rss() -> int:
+    """Resident set size of this process in bytes (Linux ``/proc``; else peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Background thread recording the highest RSS seen while it runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start_rss = 0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, _current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = self.peak_rss = _current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, _current_rss())
+
+
+def measure(func, *args, **kwargs) -> dict:
+    """Run ``func`` once with its output silenced; return wall time and RSS figures."""
+    with RssSampler() as sampler, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 4),
+        "peak_rss_mb": round(sampler.peak_rss / 1e6, 1),
+        "rss_delta_mb": round((sampler.peak_rss - sampler.start_rss) / 1e6, 1),
+    }
+
+
+def benchmark_dataset(path: str) -> dict:
+    """Time every ``RetailAnalyzer`` operation on one CSV."""
+    analyzer = RetailAnalyzer()
+    results = {"load_data": measure(analyzer.load_data, path)}
+
+    category = str(analyzer.data["Category"].dropna().iloc[0])
+    dates = analyzer.data["Date"].dropna()
+    mid = dates.iloc[len(dates) // 2]
+
+    results["filter_data"] = measure(
+        analyzer.filter_data, category, mid - pd.Timedelta(days=7), mid)
+    analyzer.filter_data()
+
+    # Clear the memo so the timing covers the actual aggregation.
+    analyzer._metrics_cache.clear()
+    results["calculate_metrics"] = measure(analyzer.calculate_metrics)
+    results["calculate_metrics_cached"] = measure(analyzer.calculate_metrics)
+
+    results["plot_sales_by_category"] = measure(analyzer.plot_sales_by_category, show=False)
+    results["plot_sales_trend"] = measure(analyzer.plot_sales_trend, show=False)
+    results["plot_price_quantity_heatmap"] = measure(analyzer.plot_price_quantity_heatmap, show=False)
+
+    results["show_missing_rows"] = measure(analyzer.show_missing_rows)
+    results["fill_missing_with_mean"] = measure(analyzer.fill_missing_with_mean)
+
+    # Dropping right after the fill would find nothing to drop; start from a fresh load.
+    fresh = RetailAnalyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh.load_data(path)
+    results["drop_missing_rows"] = measure(fresh.drop_missing_rows)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a line for every operation slower or larger than the baseline allows."""
+    regressions = []
+    for size, ops in results.items():
+        for op_name, current in ops.items():
+            previous = baseline.get(size, {}).get(op_name)
+            if previous is None:
+                continue
+            if (current["seconds"] >= MIN_COMPARABLE_SECONDS
+                    and current["seconds"] > previous["seconds"] * (1 + tolerance)):
+                regressions.append(
+                    f"{size}/{op_name}: {previous['seconds']}s -> {current['seconds']}s")
+            if (current["rss_delta_mb"] - previous["rss_delta_mb"] >= MIN_COMPARABLE_MB
+                    and current["rss_delta_mb"] > previous["rss_delta_mb"] * (1 + tolerance)):
+                regressions.append(
+                    f"{size}/{op_name}: {previous['rss_delta_mb']} MB -> {current['rss_delta_mb']} MB")
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RetailAnalyzer operations")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "1m"],
+                        help="dataset sizes to run (10k, 1m, 10m, 50m or a row count)")
+    parser.add_argument("--data-dir", default="bench_data",
+                        help="where generated datasets are kept between runs")
+    parser.add_argument("--baseline", default="benchmark_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="overwrite the baseline with this run instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    for size in args.sizes:
+        path = os.path.join(args.data_dir, f"sales_{size.lower()}.csv")
+        if not os.path.exists(path):
+            print(f"Generating {path} ...")
+            generate_sales_csv(path, parse_rows(size))
+
+        print(f"Benchmarking {path} ...")
+        results[size] = benchmark_dataset(path)
+        for op_name, r in results[size].items():
+            print(f"  {op_name:<28} {r['seconds']:>9.4f}s  peak {r['peak_rss_mb']:>8.1f} MB"
+                  f"  delta {r['rss_delta_mb']:>8.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
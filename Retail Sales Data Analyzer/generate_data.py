@@ -0,0 +1,104 @@
+import argparse
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Named dataset sizes used by the benchmark suite.
+PRESETS = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+    "50m": 50_000_000,
+}
+
+# Rows generated and written per block, so memory stays flat for any size.
+BLOCK_ROWS = 1_000_000
+
+
+def parse_rows(value: str) -> int:
+    """Accept plain integers or preset names such as ``10k`` and ``50m``."""
+    key = value.strip().lower()
+    if key in PRESETS:
+        return PRESETS[key]
+    return int(key.replace("_", ""))
+
+
+def generate_sales_csv(path: str, rows: int, products: int = 200, categories: int = 12,
+                       null_rate: float = 0.01, bad_date_rate: float = 0.0,
+                       start_date: str = "2021-01-01", days: int = 3 * 365,
+                       seed: int = 42, block_rows: int = BLOCK_ROWS) -> str:
+    """Write a synthetic retail CSV with the columns ``RetailAnalyzer`` expects.
+
+    Every product belongs to one category and has its own base price, and
+    sales volume follows a skewed (Zipf-like) product popularity. Output is
+    fully determined by the arguments, so the same seed always produces the
+    same file.
+    """
+    rng = np.random.default_rng(seed)
+
+    product_names = np.array([f"Product {i:05d}" for i in range(products)], dtype=object)
+    category_names = np.array([f"Category {i:03d}" for i in range(categories)], dtype=object)
+    product_category = category_names[rng.integers(0, categories, products)]
+    base_price = np.round(rng.lognormal(mean=3.0, sigma=0.8, size=products), 2)
+
+    popularity = 1.0 / np.arange(1, products + 1)
+    popularity /= popularity.sum()
+
+    start = np.datetime64(start_date, "D")
+    written = 0
+    header = True
+
+    while written < rows:
+        n = min(block_rows, rows - written)
+
+        product = rng.choice(products, size=n, p=popularity)
+        # Rows run chronologically through the file, like a daily export.
+        dates = start + (np.arange(written, written + n) * days // rows).astype("timedelta64[D]")
+        price = np.round(base_price[product] * rng.uniform(0.9, 1.1, n), 2)
+        quantity = rng.poisson(3, n) + 1
+
+        block = pd.DataFrame({
+            "Date": np.datetime_as_string(dates, unit="D").astype(object),
+            "Product": product_names[product],
+            "Category": product_category[product],
+            "Price": price,
+            "Quantity Sold": quantity.astype(float),
+        })
+
+        if null_rate > 0:
+            for col in block.columns:
+                block.loc[rng.random(n) < null_rate, col] = np.nan
+        if bad_date_rate > 0:
+            block.loc[rng.random(n) < bad_date_rate, "Date"] = "not-a-date"
+
+        block.to_csv(path, mode="w" if header else "a", header=header, index=False)
+        header = False
+        written += n
+
+    return path
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic retail sales CSVs")
+    parser.add_argument("rows", help="row count or preset: " + ", ".join(PRESETS))
+    parser.add_argument("-o", "--output", help="CSV path (default: sales_<rows>.csv)")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=12)
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    parser.add_argument("--bad-date-rate", type=float, default=0.0)
+    parser.add_argument("--start-date", default="2021-01-01")
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rows = parse_rows(args.rows)
+    output = args.output or f"sales_{args.rows.lower()}.csv"
+    generate_sales_csv(output, rows, products=args.products, categories=args.categories,
+                       null_rate=args.null_rate, bad_date_rate=args.bad_date_rate,
+                       start_date=args.start_date, days=args.days, seed=args.seed)
+    print(f"Wrote {rows} rows to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+class StageProfiler:
+    """Collects wall time, CPU time, rows and peak memory growth per stage.
+
+    Stages nest: a stage opened inside another is recorded as
+    ``parent/child``. Memory is measured with ``tracemalloc`` (NumPy and
+    pandas buffers included), so enabling the profiler adds some overhead;
+    it is meant for diagnostic and batch runs, not for every session.
+    """
+
+    def __init__(self):
+        self.stages: dict = {}
+        self._stack: list = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows=None):
+        """Time the enclosed block; set ``info["rows"]`` inside to record rows."""
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], peak)
+        tracemalloc.reset_peak()
+
+        path = f"{self._stack[-1]['path']}/{name}" if self._stack else name
+        frame = {"path": path, "start_mem": current, "peak": current}
+        info = {"rows": rows}
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield info
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], frame["peak"])
+            tracemalloc.reset_peak()
+            self._record(path, wall, cpu, info["rows"], frame["peak"] - frame["start_mem"])
+
+    def _record(self, path: str, wall: float, cpu: float, rows, mem_delta: int):
+        entry = self.stages.setdefault(path, {
+            "calls": 0,
+            "wall_seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "rows": 0,
+            "peak_memory_delta_bytes": 0,
+        })
+        entry["calls"] += 1
+        entry["wall_seconds"] += wall
+        entry["cpu_seconds"] += cpu
+        entry["rows"] += int(rows or 0)
+        entry["peak_memory_delta_bytes"] = max(entry["peak_memory_delta_bytes"], int(mem_delta))
+
+    def report(self) -> dict:
+        return {
+            "stages": [
+                {"stage": path, **{k: round(v, 6) if isinstance(v, float) else v
+                                   for k, v in entry.items()}}
+                for path, entry in self.stages.items()
+            ]
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str, prefix: str = "retail_analyzer"):
+        """Write the Prometheus text format for the node exporter textfile collector.
+
+        The file is written to a temporary name and renamed, so the exporter
+        never scrapes a half-written file.
+        """
+        # Calls, seconds and rows only grow, so they are counters; the peak is a gauge.
+        metrics = (
+            ("stage_calls_total", "counter", "calls", "Number of times the stage ran."),
+            ("stage_wall_seconds_total", "counter", "wall_seconds", "Wall-clock seconds spent in the stage."),
+            ("stage_cpu_seconds_total", "counter", "cpu_seconds", "CPU seconds spent in the stage."),
+            ("stage_rows_total", "counter", "rows", "Rows processed by the stage."),
+            ("stage_peak_memory_delta_bytes", "gauge", "peak_memory_delta_bytes",
+             "Largest traced memory growth during one run of the stage."),
+        )
+        lines = []
+        for metric, kind, field, help_text in metrics:
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage_path, entry in self.stages.items():
+                label = stage_path.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{stage="{label}"}} {entry[field]}')
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+def no_stage(name: str, rows=None):
+    """Stand-in for ``StageProfiler.stage`` when instrumentation is off."""
+    return contextlib.nullcontext({"rows": rows})
+
+
+def instrumented(method):
+    """Record a ``RetailAnalyzer`` method as a stage when its profiler is set.
+
+    Rows default to the size of a returned frame, else of ``self.data``.
+    With no profiler the method is called directly.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+
+        with self.profiler.stage(method.__name__) as info:
+            result = method(self, *args, **kwargs)
+            if info["rows"] is None:
+                if isinstance(result, pd.DataFrame):
+                    info["rows"] = len(result)
+                elif self.data is not None:
+                    info["rows"] = len(self.data)
+        return result
+
+    return wrapper
@@ -1,5 +1,12 @@
 
+import argparse
+import glob
+import io
+import json
 import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
 import numpy as np
@@ -7,85 +14,920 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from instrumentation import StageProfiler, instrumented, no_stage
+
 sns.set()
 
+# Key columns always read as text, so a chunk or file where every SKU or
+# category looks numeric still groups under the same keys as the rest.
+TEXT_DTYPES = {"Product": str, "Category": str}
+
+# Rows held in memory at once by the streaming load mode.
+STREAM_CHUNKSIZE = 250_000
+
+# Bump when the on-disk cache layout changes so old caches are rebuilt.
+CACHE_FORMAT_VERSION = 3
+
+# Target size of the byte ranges a single CSV is split into for parallel loads.
+PARALLEL_RANGE_BYTES = 64 * 1024 * 1024
+
+# Longest trend series render_charts draws before downsampling with LTTB.
+TREND_MAX_POINTS = 2000
+
+# File written into a partition directory to record per-file date/category bounds.
+PARTITION_MANIFEST = "_manifest.json"
+
+# String columns with at most this share of distinct values become categoricals.
+CATEGORY_MAX_RATIO = 0.5
+
+# Share of rows allowed in the unsorted tail (filled or out-of-order dates)
+# before the frame is re-sorted by Date.
+INDEX_TAIL_MAX_RATIO = 0.05
+
 
 class RetailAnalyzer:
     REQUIRED_COLUMNS = ["Date", "Product", "Category", "Price", "Quantity Sold"]
 
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None, workers: int = 1,
+                 profiler: Optional[StageProfiler] = None):
+        self.workers = max(1, workers)
+        self.profiler = profiler
         self.data: Optional[pd.DataFrame] = None
         self.last_filtered: Optional[pd.DataFrame] = None
         self.last_plot = None
+        self.stream_totals: Optional[dict] = None
+        self._dates: Optional[np.ndarray] = None
+        self._sorted_rows = 0
+        self._category_rows: dict = {}
+        self._null_positions: dict = {}
+        self._active_filter = (None, None, None)
+        self.data_version = 0
+        self._metrics_cache: dict = {}
+        self.rollup: Optional[pd.DataFrame] = None
+        self.partitions: Optional[list] = None
 
         if file_path:
             self.load_data(file_path)
 
-    def load_data(self, file_path: str) -> bool:
+    def _stage(self, name: str, rows=None):
+        """Context manager timing a sub-stage when instrumentation is on."""
+        if self.profiler is None:
+            return no_stage(name, rows)
+        return self.profiler.stage(name, rows)
+
+    @instrumented
+    def load_data(self, file_path: str, stream: bool = False,
+                  chunksize: int = STREAM_CHUNKSIZE, use_cache: bool = False,
+                  compact: bool = False, rollup: bool = False) -> bool:
+        if os.path.isdir(file_path) or glob.has_magic(file_path):
+            return self._load_partitioned(file_path)
+
+        if not os.path.exists(file_path):
+            print("File not found.")
+            return False
+
+        if stream:
+            return self._load_streaming(file_path, chunksize)
+
+        df = None
+        if use_cache:
+            with self._stage("read_cache"):
+                df = self._read_cache(file_path)
+        if df is None:
+            with self._stage("read_csv") as info:
+                try:
+                    df = self._read_csv(file_path)
+                except Exception as e:
+                    print(f"Failed to read CSV: {e}")
+                    return False
+                info["rows"] = len(df)
+
+            missing = [c for c in self.REQUIRED_COLUMNS if c not in df.columns]
+            if missing:
+                print("Missing required columns:", missing)
+                return False
+
+            df = self._coerce_types(df, self._stage)
+            with self._stage("sort_by_date", len(df)):
+                df = self._sort_by_date(df)
+            if use_cache:
+                with self._stage("write_cache", len(df)):
+                    self._write_cache(file_path, df)
+
+        self.data = df
+        self.last_filtered = df
+        self.stream_totals = None
+        self.partitions = None
+        self._active_filter = (None, None, None)
+        self._bump_version()
+        with self._stage("build_index", len(df)):
+            self._build_index()
+        with self._stage("null_scan", len(df)):
+            self._null_positions = self._scan_nulls(df)
+        self.rollup = None
+
+        print("Dataset loaded successfully!")
+        if compact:
+            self.compact_dtypes()
+        if rollup:
+            self.build_rollup()
+        print("\nMissing values per column:")
+        print(self.null_counts())
+        return True
+
+    @instrumented
+    def compact_dtypes(self, max_category_ratio: float = CATEGORY_MAX_RATIO) -> dict:
+        """Shrink ``self.data`` in place and report memory before and after.
+
+        Low-cardinality string columns become categoricals so groupbys run on
+        integer codes. Integer columns are downcast to the smallest width that
+        holds their range; float columns drop to float32 only when that is
+        lossless.
+        """
+        if self.data is None:
+            print("No dataset loaded.")
+            return {}
+
+        df = self.data
+        before = int(df.memory_usage(deep=True).sum())
+
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_object_dtype(series):
+                if series.nunique(dropna=True) <= max_category_ratio * len(series):
+                    df[col] = series.astype("category")
+            elif pd.api.types.is_integer_dtype(series):
+                df[col] = pd.to_numeric(series, downcast="integer")
+            elif pd.api.types.is_float_dtype(series):
+                values = series.to_numpy()
+                narrow = values.astype(np.float32)
+                if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+                    df[col] = narrow
+
+        after = int(df.memory_usage(deep=True).sum())
+        self._reapply_filter()
+
+        print(f"Memory usage: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB")
+        return {"before_bytes": before, "after_bytes": after}
+
+    @staticmethod
+    def _coerce_types(df: pd.DataFrame, stage=no_stage) -> pd.DataFrame:
+        df.columns = [c.strip() for c in df.columns]
+        with stage("coerce_dates", len(df)):
+            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        with stage("coerce_numeric", len(df)):
+            df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
+            df["Quantity Sold"] = pd.to_numeric(df["Quantity Sold"], errors="coerce")
+            df["Total Sales"] = df["Price"] * df["Quantity Sold"]
+        return df
+
+    @staticmethod
+    def _sort_by_date(df: pd.DataFrame) -> pd.DataFrame:
+        """Return ``df`` ordered by ``Date`` with NaT rows last.
+
+        Already-ordered frames (e.g. read back from the cache) are returned
+        as-is, so the sort is paid once per source file. Index labels keep
+        the original file order.
+        """
+        dates = df["Date"]
+        dated = int(dates.notna().sum())
+        if dates.iloc[:dated].is_monotonic_increasing and dates.iloc[dated:].isna().all():
+            return df
+        return df.sort_values("Date", kind="stable", na_position="last", ignore_index=False)
+
+    def _build_index(self):
+        """Build the lookup structures ``filter_data`` uses instead of scans.
+
+        The first ``self._sorted_rows`` rows of ``self.data`` are dated and
+        sorted, so a date range there is one ``searchsorted`` on
+        ``self._dates``. The rows after them (NaT, filled or appended out of
+        order) are checked directly; the frame is re-sorted only once more
+        than ``INDEX_TAIL_MAX_RATIO`` of it is dated rows in that tail.
+        ``self._category_rows`` maps each lower-cased category to the
+        ascending row positions holding it.
+        """
+        dates = self.data["Date"].to_numpy()
+        sorted_rows = self._sorted_prefix(dates)
+        if np.count_nonzero(~np.isnat(dates[sorted_rows:])) > INDEX_TAIL_MAX_RATIO * len(dates):
+            # Same order as _sort_by_date (stable, NaT last), but the
+            # permutation is kept to move the null positions along.
+            order = np.argsort(dates, kind="stable")
+            self.data = self.data.take(order)
+            moved = np.empty(len(order), dtype=np.intp)
+            moved[order] = np.arange(len(order))
+            self._null_positions = {col: np.sort(moved[positions])
+                                    for col, positions in self._null_positions.items()}
+            dates = self.data["Date"].to_numpy()
+            sorted_rows = self._sorted_prefix(dates)
+
+        self._dates = dates
+        self._sorted_rows = sorted_rows
+        self._category_rows = self._category_positions(self.data["Category"])
+        self._reapply_filter()
+
+    def _refresh_index(self):
+        """Pick up in-place edits to ``self.data`` that left row positions alone."""
+        self._dates = self.data["Date"].to_numpy()
+        tail = self._dates[self._sorted_rows:]
+        if np.count_nonzero(~np.isnat(tail)) > INDEX_TAIL_MAX_RATIO * len(self._dates):
+            self._build_index()
+        else:
+            self._reapply_filter()
+
+    @staticmethod
+    def _sorted_prefix(dates: np.ndarray, after=None) -> int:
+        """Length of the leading run of ``dates`` that is non-NaT and ascending."""
+        if not len(dates):
+            return 0
+        bad = np.isnat(dates)
+        bad[1:] |= dates[1:] < dates[:-1]
+        if after is not None and not np.isnat(after):
+            bad[0] |= dates[0] < after
+        return int(np.argmax(bad)) if bad.any() else len(dates)
+
+    @staticmethod
+    def _scan_nulls(df: pd.DataFrame, offset: int = 0) -> dict:
+        """Map each column to the ascending row positions (plus ``offset``) of its nulls."""
+        return {col: np.flatnonzero(df[col].isna().to_numpy()) + offset for col in df.columns}
+
+    def _null_rows(self) -> np.ndarray:
+        """Ascending row positions of rows with at least one null cell."""
+        parts = [positions for positions in self._null_positions.values() if len(positions)]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(parts))
+
+    def null_counts(self) -> pd.Series:
+        """Nulls per column, read from the bookkeeping kept since load."""
+        if self.data is None:
+            return pd.Series(dtype="int64")
+        return pd.Series({col: len(self._null_positions.get(col, ())) for col in self.data.columns},
+                         dtype="int64")
+
+    @staticmethod
+    def _category_positions(categories: pd.Series, offset: int = 0) -> dict:
+        """Map each lower-cased category to its ascending positions (plus ``offset``)."""
+        codes, uniques = pd.factorize(categories)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        category_rows = {}
+        for code, name in enumerate(uniques):
+            rows = order[bounds[code]:bounds[code + 1]] + offset
+            key = str(name).lower()
+            if key in category_rows:
+                rows = np.sort(np.concatenate([category_rows[key], rows]))
+            category_rows[key] = rows
+        return category_rows
+
+    @instrumented
+    def append_data(self, file_path: str) -> bool:
+        """Ingest one more CSV into the loaded dataset without re-reading the rest.
+
+        Only the new file is parsed and its rows go after the current data:
+        existing row positions, index entries, null bookkeeping and rollup
+        cells are kept and only extended. Rows dated before the current data
+        join the unsorted tail of the index. Cached metrics are invalidated
+        just for filters the new rows fall into.
+        """
+        if self.data is None and self.stream_totals is None and self.partitions is None:
+            return self.load_data(file_path)
+
         if not os.path.exists(file_path):
             print("File not found.")
             return False
 
+        if self.partitions is not None:
+            entry = self._scan_partition(file_path)
+            if entry is None:
+                return False
+            self.partitions = [e for e in self.partitions if e["path"] != entry["path"]] + [entry]
+            self._bump_version()
+            print(f"Partition added: {file_path} ({entry['rows']} rows).")
+            return True
+
+        if self.stream_totals is not None:
+            appended = RetailAnalyzer(workers=self.workers)
+            if not appended._load_streaming(file_path, STREAM_CHUNKSIZE):
+                return False
+            self.stream_totals = _merge_totals([self.stream_totals, appended.stream_totals])
+            self._bump_version()
+            print(f"Appended {appended.stream_totals['rows']} rows to streamed totals.")
+            return True
+
         try:
-            df = pd.read_csv(file_path)
+            new = self._read_csv(file_path)
         except Exception as e:
             print(f"Failed to read CSV: {e}")
             return False
 
-        missing = [c for c in self.REQUIRED_COLUMNS if c not in df.columns]
+        missing = [c for c in self.REQUIRED_COLUMNS if c not in new.columns]
         if missing:
             print("Missing required columns:", missing)
             return False
 
-        df.columns = [c.strip() for c in df.columns]
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
-        df["Quantity Sold"] = pd.to_numeric(df["Quantity Sold"], errors="coerce")
-        df["Total Sales"] = df["Price"] * df["Quantity Sold"]
+        new = self._sort_by_date(self._coerce_types(new))
+        new = new[[c for c in self.data.columns if c in new.columns]]
+        new.index = new.index + (self.data.index.max() + 1 if len(self.data) else 0)
+
+        for col in self.data.columns:
+            if isinstance(self.data[col].dtype, pd.CategoricalDtype) and col in new.columns:
+                extra = pd.Index(new[col].dropna().unique()).difference(self.data[col].cat.categories)
+                if len(extra):
+                    self.data[col] = self.data[col].cat.add_categories(extra)
+                new[col] = pd.Categorical(new[col], categories=self.data[col].cat.categories)
+
+        old_rows = len(self.data)
+        self.data = pd.concat([self.data, new])
+        self._bump_version(new)
+
+        for col, positions in self._scan_nulls(self.data.iloc[old_rows:], offset=old_rows).items():
+            previous = self._null_positions.get(col)
+            self._null_positions[col] = (
+                positions if previous is None else np.concatenate([previous, positions]))
+
+        if self._sorted_rows == old_rows:
+            dates = self.data["Date"].to_numpy()
+            self._sorted_rows += self._sorted_prefix(
+                dates[old_rows:], dates[old_rows - 1] if old_rows else None)
+        for key, rows in self._category_positions(new["Category"], offset=old_rows).items():
+            previous = self._category_rows.get(key)
+            self._category_rows[key] = rows if previous is None else np.concatenate([previous, rows])
+        self._refresh_index()
+
+        if self.rollup is not None:
+            self.rollup = self._merge_rollups(self.rollup, self._rollup_frame(new))
+
+        print(f"Appended {len(new)} rows ({len(self.data)} total).")
+        return True
 
-        self.data = df
-        self.last_filtered = df
+    @instrumented
+    def build_rollup(self):
+        """Pre-aggregate ``self.data`` into a day x category x product cube.
 
-        print("Dataset loaded successfully!")
+        Once built, ``calculate_metrics``, ``plot_sales_by_category`` and
+        ``plot_sales_trend`` answer the active filter from the cube, so their
+        cost scales with distinct days and categories rather than rows.
+        Dates are bucketed by day, so filter bounds apply at day granularity.
+        """
+        if self.data is None:
+            print("No dataset loaded.")
+            return
+
+        self.rollup = self._rollup_frame(self.data)
+        print(f"Rollup built: {len(self.rollup)} cells from {len(self.data)} rows.")
+
+    @staticmethod
+    def _rollup_frame(df: pd.DataFrame) -> pd.DataFrame:
+        keys = [df["Date"].dt.normalize().rename("Day"), df["Category"], df["Product"]]
+        cube = df.groupby(keys, dropna=False, observed=True).agg(
+            quantity=("Quantity Sold", "sum"),
+            sales=("Total Sales", "sum"),
+            sales_count=("Total Sales", "count"),
+            rows=("Total Sales", "size"),
+        ).reset_index()
+        cube["category_key"] = cube["Category"].astype(object).str.lower()
+        return cube
+
+    @staticmethod
+    def _merge_rollups(cube: pd.DataFrame, other: pd.DataFrame, sign: int = 1) -> pd.DataFrame:
+        """Add ``other`` into ``cube`` (``sign=-1`` takes it out again).
+
+        Cost depends on cube size, not row count. Cells left with no rows
+        are dropped.
+        """
+        measures = ["quantity", "sales", "sales_count", "rows"]
+        if sign != 1:
+            other = other.copy()
+            other[measures] = other[measures] * sign
+        merged = pd.concat([cube, other], ignore_index=True).groupby(
+            ["Day", "Category", "Product"], dropna=False, observed=True
+        )[measures].sum().reset_index()
+        merged = merged[merged["rows"] > 0].reset_index(drop=True)
+        merged["category_key"] = merged["Category"].astype(object).str.lower()
+        return merged
+
+    def _rollup_slice(self, key: tuple) -> pd.DataFrame:
+        category, start, end = key
+        cube = self.rollup
+        mask = np.ones(len(cube), dtype=bool)
+        if category:
+            mask &= (cube["category_key"] == category).to_numpy()
+        if start is not None:
+            mask &= (cube["Day"] >= start).to_numpy()
+        if end is not None:
+            mask &= (cube["Day"] <= end).to_numpy()
+        return cube[mask]
+
+    @staticmethod
+    def _rollup_monthly(cube: pd.DataFrame) -> pd.Series:
+        daily = cube.groupby("Day")["sales"].sum()
+        return daily.resample("M").sum() if not daily.empty else daily
+
+    def _rollup_metrics(self, key: tuple) -> dict:
+        cube = self._rollup_slice(key)
+        if cube.empty:
+            return {}
+
+        total_sales = cube["sales"].sum()
+        sales_count = cube["sales_count"].sum()
+        return self._build_metrics(
+            total_sales,
+            total_sales / sales_count if sales_count else np.nan,
+            cube.groupby("Product", observed=True)["quantity"].sum(),
+            cube.groupby("Category", observed=True)["sales"].sum(),
+            self._rollup_monthly(cube),
+        )
+
+    def _reapply_filter(self):
+        """Point ``last_filtered`` at the active filter over the current data."""
+        if self.data is not None:
+            self.last_filtered = self.data.iloc[self.filter_positions(*self._active_filter)]
+
+    def _bump_version(self, touched: Optional[pd.DataFrame] = None):
+        """Advance ``data_version`` and drop metrics the change can affect.
+
+        ``touched`` holds the changed rows (before and after the change).
+        Cached filters that match none of them keep their metrics and are
+        restamped with the new version; ``None`` clears the whole cache.
+        """
+        self.data_version += 1
+        if touched is None:
+            self._metrics_cache.clear()
+            return
+
+        for key in list(self._metrics_cache):
+            if self._filter_matches(key, touched):
+                del self._metrics_cache[key]
+            else:
+                self._metrics_cache[key] = (self.data_version, self._metrics_cache[key][1])
+
+    @staticmethod
+    def _filter_key(category=None, start_date=None, end_date=None) -> tuple:
+        return (
+            category.lower() if category else None,
+            pd.to_datetime(start_date) if start_date else None,
+            pd.to_datetime(end_date) if end_date else None,
+        )
+
+    @staticmethod
+    def _filter_mask(key: tuple, rows: pd.DataFrame) -> pd.Series:
+        category, start, end = key
+        mask = pd.Series(True, index=rows.index)
+        if category:
+            mask &= rows["Category"].astype(object).str.lower() == category
+        if start is not None:
+            mask &= rows["Date"] >= start
+        if end is not None:
+            mask &= rows["Date"] <= end
+        return mask
+
+    @classmethod
+    def _filter_matches(cls, key: tuple, rows: pd.DataFrame) -> bool:
+        return bool(cls._filter_mask(key, rows).any())
+
+    def _load_partitioned(self, path: str) -> bool:
+        """Register a directory or glob of CSV partitions without reading rows.
+
+        A manifest with each file's row count, Date range and categories is
+        kept next to the files and refreshed only for files whose size or
+        mtime changed. ``filter_data`` and ``calculate_metrics`` then read
+        just the partitions that can match the requested filter.
+        """
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, "*.csv")))
+            manifest_dir = path
+        else:
+            files = sorted(glob.glob(path))
+            manifest_dir = os.path.dirname(path) or "."
+
+        if not files:
+            print("No partition files found.")
+            return False
+
+        manifest_path = os.path.join(manifest_dir, PARTITION_MANIFEST)
+        try:
+            with open(manifest_path) as f:
+                known = {e["path"]: e for e in json.load(f)}
+        except (OSError, ValueError, KeyError):
+            known = {}
+
+        entries = []
+        for file_path in files:
+            st = os.stat(file_path)
+            entry = known.get(os.path.abspath(file_path))
+            if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                entry = self._scan_partition(file_path)
+                if entry is None:
+                    return False
+                known[entry["path"]] = entry
+            entries.append(entry)
+
+        try:
+            with open(manifest_path, "w") as f:
+                json.dump([e for p, e in sorted(known.items()) if os.path.exists(p)], f, indent=1)
+        except OSError as e:
+            print(f"Failed to write partition manifest: {e}")
+
+        self.data = None
+        self.last_filtered = None
+        self._null_positions = {}
+        self.stream_totals = None
+        self.rollup = None
+        self.partitions = entries
+        self._active_filter = (None, None, None)
+        self._bump_version()
+
+        rows = sum(e["rows"] for e in entries)
+        print(f"Partitioned dataset registered: {len(entries)} files, {rows} rows.")
+        return True
+
+    def _scan_partition(self, file_path: str) -> Optional[dict]:
+        """Read only Date and Category of one partition to build its manifest entry."""
+        try:
+            header = pd.read_csv(file_path, nrows=0)
+            missing = [c for c in self.REQUIRED_COLUMNS if c not in header.columns]
+            if missing:
+                print(f"Missing required columns in {file_path}:", missing)
+                return None
+
+            rows, lo, hi, categories = 0, None, None, set()
+            for chunk in pd.read_csv(file_path, usecols=["Date", "Category"], dtype=TEXT_DTYPES,
+                                     chunksize=STREAM_CHUNKSIZE):
+                rows += len(chunk)
+                dates = pd.to_datetime(chunk["Date"], errors="coerce")
+                if dates.notna().any():
+                    lo = dates.min() if lo is None else min(lo, dates.min())
+                    hi = dates.max() if hi is None else max(hi, dates.max())
+                categories.update(chunk["Category"].dropna().astype(str).str.lower().unique())
+        except Exception as e:
+            print(f"Failed to read CSV {file_path}: {e}")
+            return None
+
+        st = os.stat(file_path)
+        return {
+            "path": os.path.abspath(file_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "rows": rows,
+            "min_date": lo.isoformat() if lo is not None else None,
+            "max_date": hi.isoformat() if hi is not None else None,
+            "categories": sorted(categories),
+        }
+
+    def _select_partitions(self, key: tuple) -> list:
+        category, start, end = key
+        selected = []
+        for entry in self.partitions:
+            if start is not None or end is not None:
+                if entry["min_date"] is None:
+                    continue
+                if start is not None and pd.Timestamp(entry["max_date"]) < start:
+                    continue
+                if end is not None and pd.Timestamp(entry["min_date"]) > end:
+                    continue
+            if category and category not in entry["categories"]:
+                continue
+            selected.append(entry["path"])
+
+        print(f"Reading {len(selected)} of {len(self.partitions)} partitions.")
+        return selected
+
+    def _read_partitions(self, key: tuple) -> pd.DataFrame:
+        """Read, coerce and filter only the partitions whose bounds can match ``key``."""
+        selected = self._select_partitions(key)
+        if not selected:
+            return pd.DataFrame(columns=self.REQUIRED_COLUMNS + ["Total Sales"])
+
+        df = pd.concat(self._map(_read_coerced, selected), ignore_index=True)
+        df = self._sort_by_date(df)
+        if any(key):
+            df = df[self._filter_mask(key, df).to_numpy()]
+        return df
+
+    def _aggregate_partitions(self, key: tuple) -> dict:
+        """Aggregate the matching partitions byte range by byte range, without a frame."""
+        tasks = []
+        for path in self._select_partitions(key):
+            columns = list(pd.read_csv(path, nrows=0).columns)
+            tasks.extend(
+                (path, start, end, columns, key, STREAM_CHUNKSIZE)
+                for start, end in _byte_ranges(path)
+            )
+        return _merge_totals(self._map(_aggregate_csv_range, tasks))
+
+    @staticmethod
+    def _cache_dir(file_path: str) -> str:
+        return file_path + ".cache"
+
+    @staticmethod
+    def _cache_key(file_path: str) -> dict:
+        st = os.stat(file_path)
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "path": os.path.abspath(file_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def _read_cache(self, file_path: str) -> Optional[pd.DataFrame]:
+        """Return the cached typed frame for ``file_path``, or ``None`` if stale.
+
+        Numeric and date columns are memory-mapped copy-on-write, so pages are
+        only read when touched and in-place cleaning never writes back.
+        """
+        cache_dir = self._cache_dir(file_path)
+        try:
+            with open(os.path.join(cache_dir, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get("key") != self._cache_key(file_path):
+            print("Cache is stale, rebuilding from CSV.")
+            return None
+
+        columns = {}
+        try:
+            for i, col in enumerate(manifest["columns"]):
+                values = np.load(os.path.join(cache_dir, f"col_{i}.npy"), mmap_mode="c")
+                if col["kind"] == "datetime":
+                    columns[col["name"]] = values.view("datetime64[ns]")
+                elif col["kind"] == "string":
+                    uniques = np.array(col["uniques"] + [np.nan], dtype=object)
+                    columns[col["name"]] = uniques[values]
+                else:
+                    columns[col["name"]] = values
+            index = np.load(os.path.join(cache_dir, "index.npy"))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Failed to read cache: {e}")
+            return None
+
+        print("Loaded dataset from cache.")
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _write_cache(self, file_path: str, df: pd.DataFrame):
+        """Store ``df`` as one ``.npy`` file per column next to ``file_path``.
+
+        The manifest is written last, so an interrupted write is treated as a
+        missing cache on the next load.
+        """
+        cache_dir = self._cache_dir(file_path)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        try:
+            os.makedirs(cache_dir)
+            columns = []
+            for i, name in enumerate(df.columns):
+                series = df[name]
+                col = {"name": name}
+                if pd.api.types.is_datetime64_any_dtype(series):
+                    col["kind"] = "datetime"
+                    values = series.to_numpy(dtype="datetime64[ns]").view("i8")
+                elif pd.api.types.is_numeric_dtype(series):
+                    col["kind"] = "numeric"
+                    values = series.to_numpy()
+                else:
+                    # Strings become int32 codes; -1 (missing) indexes the
+                    # trailing NaN that _read_cache appends to the uniques.
+                    col["kind"] = "string"
+                    codes, uniques = pd.factorize(series)
+                    col["uniques"] = [str(u) for u in uniques]
+                    values = codes.astype(np.int32)
+                np.save(os.path.join(cache_dir, f"col_{i}.npy"), values)
+                columns.append(col)
+
+            np.save(os.path.join(cache_dir, "index.npy"), df.index.to_numpy())
+
+            with open(os.path.join(cache_dir, "manifest.json"), "w") as f:
+                json.dump({"key": self._cache_key(file_path), "columns": columns}, f)
+        except OSError as e:
+            print(f"Failed to write cache: {e}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def _load_streaming(self, file_path: str, chunksize: int) -> bool:
+        """Read the CSV in chunks and keep only running aggregates.
+
+        Rows are discarded after each chunk, so peak memory is bounded by
+        ``chunksize`` instead of the file size. ``self.data`` stays ``None``;
+        ``calculate_metrics`` answers from ``self.stream_totals`` instead.
+        """
+        try:
+            header = pd.read_csv(file_path, nrows=0)
+        except Exception as e:
+            print(f"Failed to read CSV: {e}")
+            return False
+
+        missing = [c for c in self.REQUIRED_COLUMNS if c not in header.columns]
+        if missing:
+            print("Missing required columns:", missing)
+            return False
+
+        # Both paths run the same per-range aggregation; workers=1 simply
+        # processes the ranges in this process, so results are identical.
+        tasks = [
+            (file_path, start, end, list(header.columns), (None, None, None), chunksize)
+            for start, end in _byte_ranges(file_path)
+        ]
+        try:
+            totals = _merge_totals(self._map(_aggregate_csv_range, tasks))
+        except Exception as e:
+            print(f"Failed to read CSV: {e}")
+            return False
+
+        if totals["null_counts"] is None:
+            totals["null_counts"] = pd.Series(0, index=[c.strip() for c in header.columns] + ["Total Sales"])
+
+        self.data = None
+        self.last_filtered = None
+        self._null_positions = {}
+        self.rollup = None
+        self.partitions = None
+        self.stream_totals = totals
+
+        print(f"Dataset streamed successfully! ({totals['rows']} rows, {len(tasks)} ranges)")
         print("\nMissing values per column:")
-        print(df.isnull().sum())
+        print(totals["null_counts"])
         return True
 
+    @instrumented
     def show_missing_rows(self):
         if self.data is None:
             print("No dataset loaded.")
             return
-        missing_rows = self.data[self.data.isnull().any(axis=1)]
+        # Index labels are the file order the rows were read in.
+        missing_rows = self.data.iloc[self._null_rows()].sort_index()
         print(missing_rows)
 
+    @instrumented
     def fill_missing_with_mean(self):
+        """Impute nulls in place, writing only the cells recorded as null.
+
+        Numeric columns get their column mean, ``Date`` is forward- then
+        back-filled in file order (the index labels) and ``Product`` /
+        ``Category`` become ``"Unknown"``. Filled rows keep their positions;
+        rows whose date was filled stay in the unsorted tail of the index.
+        """
         if self.data is None:
             print("No dataset loaded.")
             return
 
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-        self.data[numeric_cols] = self.data[numeric_cols].fillna(self.data[numeric_cols].mean())
+        df = self.data
+        null_rows = self._null_rows()
+        if not len(null_rows):
+            print("Missing values filled.")
+            return
 
-        self.data["Date"] = self.data["Date"].fillna(method="ffill").fillna(method="bfill")
-        self.data["Product"] = self.data["Product"].fillna("Unknown")
-        self.data["Category"] = self.data["Category"].fillna("Unknown")
+        touched = df.iloc[null_rows]
+
+        # Same columns as select_dtypes(include=[np.number]), which would copy them.
+        numeric_cols = [col for col, dtype in df.dtypes.items()
+                        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+        for col in numeric_cols:
+            positions = self._null_positions.get(col, ())
+            if len(positions):
+                df.iloc[positions, df.columns.get_loc(col)] = df[col].dtype.type(df[col].mean())
+
+        positions = self._null_positions.get("Date", ())
+        if len(positions):
+            df.iloc[positions, df.columns.get_loc("Date")] = self._fill_dates(positions)
+
+        for col in ("Product", "Category"):
+            positions = self._null_positions.get(col, ())
+            if not len(positions):
+                continue
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and "Unknown" not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories("Unknown")
+            df.iloc[positions, df.columns.get_loc(col)] = "Unknown"
+            if col == "Category":
+                previous = self._category_rows.get("unknown")
+                self._category_rows["unknown"] = (
+                    positions if previous is None else np.union1d(previous, positions))
+
+        # Only cells that were null can have changed, so only they are rechecked.
+        for col, positions in self._null_positions.items():
+            if len(positions):
+                self._null_positions[col] = positions[df[col].iloc[positions].isna().to_numpy()]
+
+        filled_rows = df.iloc[null_rows]
+        self._bump_version(pd.concat([touched, filled_rows]))
+        self._refresh_index()
+        if self.rollup is not None:
+            self.rollup = self._merge_rollups(
+                self._merge_rollups(self.rollup, self._rollup_frame(touched), sign=-1),
+                self._rollup_frame(filled_rows))
 
         print("Missing values filled.")
 
+    def _fill_dates(self, positions: np.ndarray) -> np.ndarray:
+        """Forward- then back-filled ``Date`` values for the NaT rows at ``positions``.
+
+        File order is the order of the index labels. Each run of consecutive
+        NaT rows takes the date of the row just before it, or just after it
+        when the run starts the file. Only those neighbours are looked up.
+        """
+        index = self.data.index
+        n = len(index)
+        labels = index[positions].to_numpy()
+        by_label = np.argsort(labels, kind="stable")
+        labels = labels[by_label]
+
+        # Without dropped rows the labels are exactly the file order ranks.
+        file_order = None if index.min() == 0 and index.max() == n - 1 else np.sort(index.to_numpy())
+        ranks = labels if file_order is None else np.searchsorted(file_order, labels)
+
+        starts = np.flatnonzero(np.diff(ranks, prepend=-2) != 1)
+        ends = np.append(starts[1:], len(ranks)) - 1
+        source = ranks[starts] - 1
+        leading = source < 0
+        source[leading] = ranks[ends[leading]] + 1
+        valid = source < n
+
+        values = np.full(len(starts), np.datetime64("NaT"), dtype=self._dates.dtype)
+        if valid.any():
+            wanted = source[valid] if file_order is None else file_order[source[valid]]
+            # Find the neighbours by scanning for their labels rather than
+            # building a hash table over the whole index.
+            found = np.flatnonzero(index.isin(wanted))
+            found_labels = index[found].to_numpy()
+            order = np.argsort(found_labels)
+            rows = found[order][np.searchsorted(found_labels[order], wanted)]
+            values[valid] = self._dates[rows]
+
+        filled = np.empty(len(positions), dtype=values.dtype)
+        filled[by_label] = np.repeat(values, ends - starts + 1)
+        return filled
+
+    @instrumented
     def drop_missing_rows(self):
+        """Drop every row with a null, using the null bookkeeping instead of a scan.
+
+        pandas cannot shrink a frame in place, so the kept rows are copied
+        once; no null mask of the whole frame is built. Index positions and
+        rollup cells are adjusted rather than rebuilt.
+        """
         if self.data is None:
             print("No dataset loaded.")
             return
 
         before = len(self.data)
-        self.data.dropna(inplace=True)
+        dropped = self._null_rows()
+        if len(dropped):
+            touched = self.data.iloc[dropped]
+            keep = np.ones(before, dtype=bool)
+            keep[dropped] = False
+            self.data = self.data[keep]
+
+            # Surviving rows keep their order, so positions shift down by the
+            # number of dropped rows before them.
+            self._sorted_rows -= int(np.searchsorted(dropped, self._sorted_rows))
+            for key, rows in list(self._category_rows.items()):
+                rows = rows[keep[rows]]
+                self._category_rows[key] = rows - np.searchsorted(dropped, rows)
+            self._null_positions = {col: positions[:0] for col, positions in self._null_positions.items()}
+
+            self._bump_version(touched)
+            self._refresh_index()
+            if self.rollup is not None:
+                self.rollup = self._merge_rollups(self.rollup, self._rollup_frame(touched), sign=-1)
         after = len(self.data)
 
         print(f"Dropped {before - after} rows.")
 
+    @instrumented
     def calculate_metrics(self, df=None) -> dict:
+        """Return the summary metrics for ``df`` (default: the whole dataset).
+
+        Results for the whole dataset and for ``last_filtered`` are memoized
+        per filter and stamped with ``data_version``; other frames are always
+        computed afresh.
+        """
+        key = None
         if df is None:
             df = self.data
+            key = self._filter_key()
+        elif df is self.last_filtered:
+            key = self._active_filter
+
+        if key is not None and (df is not None or self.partitions is not None):
+            cached = self._metrics_cache.get(key)
+            if cached is not None and cached[0] == self.data_version:
+                return dict(cached[1])
+            with self._stage("compute", len(df) if df is not None else None):
+                if self.rollup is not None:
+                    metrics = self._rollup_metrics(key)
+                elif df is None:
+                    metrics = self._totals_metrics(self._aggregate_partitions(key))
+                else:
+                    metrics = self._compute_metrics(df)
+            self._metrics_cache[key] = (self.data_version, metrics)
+            return dict(metrics)
+
+        with self._stage("compute", len(df) if df is not None else None):
+            return self._compute_metrics(df)
+
+    def _compute_metrics(self, df) -> dict:
+        if df is None and self.stream_totals is not None:
+            return self._totals_metrics(self.stream_totals)
 
         if df is None or df.empty:
             return {}
@@ -93,10 +935,48 @@ class RetailAnalyzer:
         total_sales = df["Total Sales"].sum()
         avg_sales = df["Total Sales"].mean()
 
-        popular_product = df.groupby("Product")["Quantity Sold"].sum().sort_values(ascending=False)
-        top_category = df.groupby("Category")["Total Sales"].sum().sort_values(ascending=False)
-
+        product_quantity = df.groupby("Product", observed=True)["Quantity Sold"].sum()
+        category_sales = df.groupby("Category", observed=True)["Total Sales"].sum()
         monthly_sales = df.set_index("Date").resample("M")["Total Sales"].sum()
+
+        return self._build_metrics(total_sales, avg_sales, product_quantity,
+                                   category_sales, monthly_sales)
+
+    @classmethod
+    def _totals_metrics(cls, totals: dict) -> dict:
+        if totals["rows"] == 0:
+            return {}
+        return cls._build_metrics(
+            totals["total_sales"],
+            totals["total_sales"] / totals["sales_count"] if totals["sales_count"] else np.nan,
+            totals["product_quantity"],
+            totals["category_sales"],
+            totals["monthly_sales"],
+        )
+
+    def _read_csv(self, file_path: str) -> pd.DataFrame:
+        """Parse a whole CSV; with ``workers > 1`` its byte ranges are parsed in the pool.
+
+        The ranges are concatenated in file order with a fresh index, as one
+        ``read_csv`` would return them.
+        """
+        ranges = _byte_ranges(file_path) if self.workers > 1 else []
+        if len(ranges) < 2:
+            return pd.read_csv(file_path, dtype=TEXT_DTYPES)
+        columns = list(pd.read_csv(file_path, nrows=0).columns)
+        parts = self._map(_read_csv_range, [(file_path, start, end, columns) for start, end in ranges])
+        return pd.concat(parts, ignore_index=True)
+
+    def _map(self, func, tasks: list) -> list:
+        """Run ``func`` over ``tasks`` in a process pool when ``workers > 1``."""
+        if self.workers == 1 or len(tasks) < 2:
+            return [func(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+            return list(pool.map(func, tasks))
+
+    @staticmethod
+    def _build_metrics(total_sales, avg_sales, product_quantity: pd.Series,
+                       category_sales: pd.Series, monthly_sales: pd.Series) -> dict:
         growth = (
             monthly_sales.pct_change().fillna(0).iloc[-1] * 100
             if len(monthly_sales) > 1 else 0
@@ -105,11 +985,12 @@ class RetailAnalyzer:
         return {
             "total_sales": float(total_sales),
             "average_sales": float(avg_sales),
-            "most_popular_product": popular_product.index[0] if not popular_product.empty else None,
-            "top_category": top_category.index[0] if not top_category.empty else None,
+            "most_popular_product": product_quantity.idxmax() if not product_quantity.empty else None,
+            "top_category": category_sales.idxmax() if not category_sales.empty else None,
             "last_month_growth_pct": float(growth)
         }
 
+    @instrumented
     def display_summary(self):
         metrics = self.calculate_metrics(self.last_filtered)
 
@@ -118,75 +999,185 @@ class RetailAnalyzer:
             print(f"{key}: {value}")
         print("==============================\n")
 
+    @instrumented
     def filter_data(self, category=None, start_date=None, end_date=None):
-        if self.data is None:
+        if self.data is None and self.partitions is None:
             raise RuntimeError("No dataset loaded.")
 
-        df = self.data.copy()
-
-        if category:
-            df = df[df["Category"].str.lower() == category.lower()]
-        if start_date:
-            df = df[df["Date"] >= pd.to_datetime(start_date)]
-        if end_date:
-            df = df[df["Date"] <= pd.to_datetime(end_date)]
+        key = self._filter_key(category, start_date, end_date)
+        if self.data is None:
+            df = self._read_partitions(key)
+        else:
+            df = self.data.iloc[self.filter_positions(category, start_date, end_date)]
 
         self.last_filtered = df
+        self._active_filter = key
         return df
 
-    def plot_sales_by_category(self, df=None):
-        df = df or self.last_filtered
+    def filter_positions(self, category=None, start_date=None, end_date=None):
+        """Return the row positions of ``self.data`` matching the filter.
+
+        Without a category this is a ``slice`` over the date-sorted frame;
+        with one it is an ascending array taken from the category index.
+        Matching rows from the unsorted tail are appended after the slice.
+        """
+        if self.data is None:
+            raise RuntimeError("No dataset loaded.")
+
+        lo, hi = 0, len(self.data)
+        tail = None
+        if start_date or end_date:
+            start = np.datetime64(pd.to_datetime(start_date)) if start_date else None
+            end = np.datetime64(pd.to_datetime(end_date)) if end_date else None
+            hi = self._sorted_rows
+            dates = self._dates[:hi]
+            if start is not None:
+                lo = int(np.searchsorted(dates, start, side="left"))
+            if end is not None:
+                hi = int(np.searchsorted(dates, end, side="right"))
+            hi = max(lo, hi)
+
+            # Any date bound excludes NaT rows, which sit in the tail.
+            tail_dates = self._dates[self._sorted_rows:]
+            mask = ~np.isnat(tail_dates)
+            if start is not None:
+                mask &= tail_dates >= start
+            if end is not None:
+                mask &= tail_dates <= end
+            tail = np.flatnonzero(mask) + self._sorted_rows
+
+        if not category:
+            if tail is None or not len(tail):
+                return slice(lo, hi)
+            return np.concatenate([np.arange(lo, hi), tail])
+
+        rows = self._category_rows.get(category.lower(), np.empty(0, dtype=np.intp))
+        selected = rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+        if tail is not None and len(tail):
+            tail_rows = rows[np.searchsorted(rows, self._sorted_rows):]
+            selected = np.concatenate([selected, tail_rows[np.isin(tail_rows, tail)]])
+        return selected
+
+    def _category_sales_data(self, df=None) -> Optional[pd.Series]:
+        if df is None and self.rollup is not None:
+            cube = self._rollup_slice(self._active_filter)
+            category_sales = cube.groupby("Category", observed=True)["sales"].sum()
+        else:
+            df = self.last_filtered if df is None else df
+            if df is None or df.empty:
+                return None
+            category_sales = df.groupby("Category", observed=True)["Total Sales"].sum()
+        return category_sales if not category_sales.empty else None
+
+    def _trend_data(self, df=None, freq: str = "M") -> Optional[pd.Series]:
+        if df is None and self.rollup is not None:
+            cube = self._rollup_slice(self._active_filter)
+            trend = self._rollup_monthly(cube) if freq == "M" else (
+                cube.groupby("Day")["sales"].sum().resample(freq).sum())
+        else:
+            df = self.last_filtered if df is None else df
+            if df is None or df.empty:
+                return None
+            trend = df.set_index("Date").resample(freq)["Total Sales"].sum()
+        return trend if not trend.empty else None
+
+    def _correlation_data(self, df=None) -> Optional[pd.DataFrame]:
+        df = self.last_filtered if df is None else df
         if df is None or df.empty:
+            return None
+        return df[["Price", "Quantity Sold", "Total Sales"]].corr()
+
+    @instrumented
+    def plot_sales_by_category(self, df=None, show: bool = True):
+        with self._stage("aggregate"):
+            category_sales = self._category_sales_data(df)
+        if category_sales is None:
             print("No data available to plot.")
             return
 
-        plt.close()
-        category_sales = df.groupby("Category")["Total Sales"].sum().reset_index()
-
-        plt.figure(figsize=(8, 5))
-        sns.barplot(data=category_sales, x="Category", y="Total Sales")
-        plt.title("Sales by Category")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        with self._stage("render", len(category_sales)):
+            plt.close()
+            plt.figure(figsize=(8, 5))
+            _draw_sales_by_category(plt.gca(), category_sales)
+            plt.tight_layout()
 
         self.last_plot = plt.gcf()
-        plt.show()
-
-    def plot_sales_trend(self, df=None):
-        df = df or self.last_filtered
-        if df is None or df.empty:
+        if show:
+            plt.show()
+
+    @instrumented
+    def plot_sales_trend(self, df=None, show: bool = True):
+        with self._stage("aggregate"):
+            monthly = self._trend_data(df)
+        if monthly is None:
             print("No data available to plot.")
             return
 
-        plt.close()
-        monthly = df.set_index("Date").resample("M")["Total Sales"].sum().reset_index()
-
-        plt.figure(figsize=(8, 5))
-        sns.lineplot(data=monthly, x="Date", y="Total Sales", marker="o")
-        plt.title("Sales Trend Over Time")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        with self._stage("render", len(monthly)):
+            plt.close()
+            plt.figure(figsize=(8, 5))
+            _draw_sales_trend(plt.gca(), monthly)
+            plt.tight_layout()
 
         self.last_plot = plt.gcf()
-        plt.show()
-
-    def plot_price_quantity_heatmap(self, df=None):
-        df = df or self.last_filtered
-        if df is None or df.empty:
+        if show:
+            plt.show()
+
+    @instrumented
+    def plot_price_quantity_heatmap(self, df=None, show: bool = True):
+        with self._stage("aggregate"):
+            corr = self._correlation_data(df)
+        if corr is None:
             print("No data available to plot.")
             return
 
-        plt.close()
-        corr = df[["Price", "Quantity Sold", "Total Sales"]].corr()
-
-        plt.figure(figsize=(6, 4))
-        sns.heatmap(corr, annot=True)
-        plt.title("Correlation Heatmap")
-        plt.tight_layout()
+        with self._stage("render"):
+            plt.close()
+            plt.figure(figsize=(6, 4))
+            _draw_correlation_heatmap(plt.gca(), corr)
+            plt.tight_layout()
 
         self.last_plot = plt.gcf()
-        plt.show()
-
+        if show:
+            plt.show()
+
+    @instrumented
+    def render_charts(self, out_dir: str, df=None, trend_freq: str = "M",
+                      max_points: int = TREND_MAX_POINTS) -> list:
+        """Render all three charts straight to PNG files without a GUI.
+
+        Only the small aggregated inputs (category totals, trend series,
+        correlation matrix) are computed here; drawing happens on
+        off-screen Agg canvases, one chart per worker when ``workers > 1``.
+        Long trend series (e.g. ``trend_freq="D"`` over several years) are
+        reduced to ``max_points`` with LTTB, which keeps peaks and dips.
+        """
+        with self._stage("aggregate"):
+            trend = self._trend_data(df, trend_freq)
+            if trend is not None and len(trend) > max_points:
+                keep = lttb_indices(trend.index.asi8.astype(float), trend.to_numpy(dtype=float), max_points)
+                trend = trend.iloc[keep]
+            charts = (
+                ("category", self._category_sales_data(df), "sales_by_category.png"),
+                ("trend", trend, "sales_trend.png"),
+                ("heatmap", self._correlation_data(df), "correlation_heatmap.png"),
+            )
+
+        tasks = []
+        for kind, data, filename in charts:
+            if data is None:
+                print(f"No data available to plot {filename}.")
+                continue
+            tasks.append((kind, data, os.path.join(out_dir, filename)))
+
+        os.makedirs(out_dir, exist_ok=True)
+        with self._stage("render", len(tasks)):
+            paths = self._map(_render_chart, tasks)
+        for path in paths:
+            print(f"Plot saved as: {path}")
+        return paths
+
+    @instrumented
     def save_last_plot(self, filename: str):
         if self.last_plot is None:
             print("No plot to save.")
@@ -195,6 +1186,181 @@ class RetailAnalyzer:
         print(f"Plot saved as: {filename}")
 
 
+def _draw_sales_by_category(ax, category_sales: pd.Series):
+    data = category_sales.rename("Total Sales").rename_axis("Category").reset_index()
+    sns.barplot(data=data, x="Category", y="Total Sales", ax=ax)
+    ax.set_title("Sales by Category")
+    ax.tick_params(axis="x", labelrotation=45)
+
+
+def _draw_sales_trend(ax, trend: pd.Series):
+    data = trend.rename("Total Sales").rename_axis("Date").reset_index()
+    sns.lineplot(data=data, x="Date", y="Total Sales", marker="o" if len(data) <= 60 else None, ax=ax)
+    ax.set_title("Sales Trend Over Time")
+    ax.tick_params(axis="x", labelrotation=45)
+
+
+def _draw_correlation_heatmap(ax, corr: pd.DataFrame):
+    sns.heatmap(corr, annot=True, ax=ax)
+    ax.set_title("Correlation Heatmap")
+
+
+def _render_chart(task: tuple) -> str:
+    """Worker: draw one chart on an off-screen Agg canvas and save it."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    kind, data, path = task
+    fig = Figure(figsize=(6, 4) if kind == "heatmap" else (8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if kind == "category":
+        _draw_sales_by_category(ax, data)
+    elif kind == "trend":
+        _draw_sales_trend(ax, data)
+    else:
+        _draw_correlation_heatmap(ax, data)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling; returns the kept positions.
+
+    The first and last points are always kept. Each middle bucket keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves the visual shape of the series.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        next_hi = min(int((i + 2) * every) + 1, n)
+        avg_x = x[hi:next_hi].mean() if next_hi > hi else x[-1]
+        avg_y = y[hi:next_hi].mean() if next_hi > hi else y[-1]
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _empty_totals() -> dict:
+    return {
+        "rows": 0,
+        "total_sales": 0.0,
+        "sales_count": 0,
+        "product_quantity": pd.Series(dtype=float),
+        "category_sales": pd.Series(dtype=float),
+        "monthly_sales": pd.Series(dtype=float),
+        "null_counts": None,
+    }
+
+
+def _add_chunk_totals(totals: dict, chunk: pd.DataFrame):
+    """Fold one coerced chunk into running ``totals`` in place."""
+    nulls = chunk.isnull().sum()
+    totals["null_counts"] = nulls if totals["null_counts"] is None else totals["null_counts"] + nulls
+    totals["rows"] += len(chunk)
+    totals["total_sales"] += chunk["Total Sales"].sum()
+    totals["sales_count"] += int(chunk["Total Sales"].count())
+    totals["product_quantity"] = totals["product_quantity"].add(
+        chunk.groupby("Product", observed=True)["Quantity Sold"].sum(), fill_value=0)
+    totals["category_sales"] = totals["category_sales"].add(
+        chunk.groupby("Category", observed=True)["Total Sales"].sum(), fill_value=0)
+    if chunk["Date"].notna().any():
+        totals["monthly_sales"] = totals["monthly_sales"].add(
+            chunk.set_index("Date").resample("M")["Total Sales"].sum(), fill_value=0)
+
+
+def _merge_totals(parts: list) -> dict:
+    """Merge partial totals in order and close gaps in the monthly buckets."""
+    totals = _empty_totals()
+    for part in parts:
+        if part["null_counts"] is None:
+            continue
+        totals["null_counts"] = (
+            part["null_counts"] if totals["null_counts"] is None
+            else totals["null_counts"] + part["null_counts"]
+        )
+        totals["rows"] += part["rows"]
+        totals["total_sales"] += part["total_sales"]
+        totals["sales_count"] += part["sales_count"]
+        for name in ("product_quantity", "category_sales", "monthly_sales"):
+            totals[name] = totals[name].add(part[name], fill_value=0)
+
+    # Parts only cover the months they contain; resample again so gaps
+    # become explicit zero months, exactly as a single resample would.
+    if not totals["monthly_sales"].empty:
+        totals["monthly_sales"] = totals["monthly_sales"].resample("M").sum()
+    return totals
+
+
+def _byte_ranges(file_path: str, target: int = PARALLEL_RANGE_BYTES) -> list:
+    """Split a CSV body into ``(start, end)`` byte ranges aligned to line starts.
+
+    Ranges depend only on the file and ``target``, not on the worker count.
+    Quoted fields containing newlines are not supported.
+    """
+    size = os.path.getsize(file_path)
+    bounds = []
+    with open(file_path, "rb") as f:
+        f.readline()
+        offset = f.tell()
+        while offset < size:
+            bounds.append(offset)
+            f.seek(min(offset + target, size))
+            if f.tell() < size:
+                f.readline()
+            offset = f.tell()
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_coerced(file_path: str) -> pd.DataFrame:
+    """Worker: parse and coerce one partition file."""
+    return RetailAnalyzer._coerce_types(pd.read_csv(file_path, dtype=TEXT_DTYPES))
+
+
+def _read_csv_range(task: tuple) -> pd.DataFrame:
+    """Worker: parse one byte range of a CSV into a frame."""
+    file_path, start, end, columns = task
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        body = f.read(end - start)
+    if not body.strip():
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(io.BytesIO(body), header=None, names=columns, dtype=TEXT_DTYPES)
+
+
+def _aggregate_csv_range(task: tuple) -> dict:
+    """Worker: parse one byte range of a CSV and return its partial totals."""
+    file_path, start, end, columns, key, chunksize = task
+    totals = _empty_totals()
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        body = f.read(end - start)
+    if not body.strip():
+        return totals
+
+    # Each chunk infers its own dtypes; the key columns are pinned to text.
+    chunks = pd.read_csv(io.BytesIO(body), header=None, names=columns, dtype=TEXT_DTYPES, chunksize=chunksize)
+    for chunk in chunks:
+        chunk = RetailAnalyzer._coerce_types(chunk)
+        if any(key):
+            chunk = chunk[RetailAnalyzer._filter_mask(key, chunk).to_numpy()]
+        _add_chunk_totals(totals, chunk)
+    return totals
+
+
 def main():
         analyzer = RetailAnalyzer()
         print("***** Retail Sales Data Analyzer *****")
@@ -269,5 +1435,91 @@ def main():
                 print("Error:", e)
 
 
+def run_batch(argv: list) -> int:
+    """Run load -> clean -> metrics -> plots for each dataset without prompts.
+
+    Each dataset gets ``<output-dir>/<name>/`` with ``metrics.json`` and the
+    three charts as PNG files. All datasets run in one process so the
+    pandas/matplotlib import cost is paid once per batch.
+    """
+    parser = argparse.ArgumentParser(description="Retail Sales Data Analyzer (batch mode)")
+    parser.add_argument("paths", nargs="+", help="CSV files, partition directories or globs")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("--category")
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    parser.add_argument("--clean", choices=["none", "fill", "drop"], default="none")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for parsing CSV byte ranges, streaming and partition reads")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--rollup", action="store_true")
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--trend-freq", default="M", help="trend bucket, e.g. M, W or D")
+    parser.add_argument("--profile-json", help="write per-stage timings and memory as JSON")
+    parser.add_argument("--prometheus-file", help="write per-stage metrics in Prometheus text format")
+    args = parser.parse_args(argv)
+
+    # Partitioned inputs stay on disk; these steps need the rows in memory.
+    in_memory_flags = [flag for flag, used in (("--clean", args.clean != "none"), ("--compact", args.compact),
+                                               ("--rollup", args.rollup), ("--cache", args.cache)) if used]
+    partitioned = [p for p in args.paths if os.path.isdir(p) or glob.has_magic(p)]
+    if in_memory_flags and partitioned:
+        parser.error(f"{', '.join(in_memory_flags)} cannot be used with directory or glob inputs: "
+                     + ", ".join(partitioned))
+
+    profiler = StageProfiler() if args.profile_json or args.prometheus_file else None
+
+    plt.switch_backend("Agg")
+    failures = 0
+    used_names = set()
+
+    for path in args.paths:
+        name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0] or "dataset"
+        name = name.replace("*", "all")
+        base, n = name, 1
+        while name in used_names:
+            n += 1
+            name = f"{base}_{n}"
+        used_names.add(name)
+
+        out_dir = os.path.join(args.output_dir, name)
+        print(f"\n=== {path} -> {out_dir} ===")
+
+        try:
+            analyzer = RetailAnalyzer(workers=args.workers, profiler=profiler)
+            if not analyzer.load_data(path, use_cache=args.cache, compact=args.compact,
+                                      rollup=args.rollup):
+                failures += 1
+                continue
+            os.makedirs(out_dir, exist_ok=True)
+
+            if args.clean == "fill":
+                analyzer.fill_missing_with_mean()
+            elif args.clean == "drop":
+                analyzer.drop_missing_rows()
+
+            analyzer.filter_data(args.category, args.start_date, args.end_date)
+
+            metrics = analyzer.calculate_metrics(analyzer.last_filtered)
+            with open(os.path.join(out_dir, "metrics.json"), "w") as f:
+                json.dump(metrics, f, indent=2, default=str)
+
+            analyzer.render_charts(out_dir, trend_freq=args.trend_freq)
+        except Exception as e:
+            print("Error:", e)
+            failures += 1
+
+    if profiler is not None:
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+        if args.prometheus_file:
+            profiler.write_prometheus(args.prometheus_file)
+
+    print(f"\nBatch finished: {len(args.paths) - failures} succeeded, {failures} failed.")
+    return 1 if failures else 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
     main()
@@ -0,0 +1,175 @@
+import contextlib
+import functools
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import op
+from op import RetailAnalyzer
+
+
+def _load(path, workers=1, **kwargs):
+    analyzer = RetailAnalyzer(workers=workers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert analyzer.load_data(str(path), **kwargs)
+    return analyzer
+
+
+@pytest.fixture
+def numeric_sku_csv(tmp_path):
+    # The first rows hold only numeric-looking SKUs and categories, later
+    # ones mix them with text, so chunks would infer different dtypes.
+    rows = [(f"2024-01-{i % 28 + 1:02d}", 1001 if i % 2 else 7, 10, 2.5, 1) for i in range(40)]
+    rows += [("2024-02-03", "Gizmo", "Toys", 1.0, 3), ("2024-02-04", 1001, "Toys", 2.0, 5),
+             ("2024-02-05", "", "", 4.0, 2), ("2024-03-01", 1001, 10, 1.0, 1000)]
+    frame = pd.DataFrame(rows, columns=["Date", "Product", "Category", "Price", "Quantity Sold"])
+    (tmp_path / "parts").mkdir()
+    frame.to_csv(tmp_path / "sales.csv", index=False)
+    frame.iloc[:40].to_csv(tmp_path / "parts" / "a.csv", index=False)
+    frame.iloc[40:].to_csv(tmp_path / "parts" / "b.csv", index=False)
+    return tmp_path
+
+
+def test_streamed_and_partitioned_metrics_match_in_memory(numeric_sku_csv):
+    expected = _load(numeric_sku_csv / "sales.csv").calculate_metrics()
+    streamed = _load(numeric_sku_csv / "sales.csv", stream=True, chunksize=7)
+    partitioned = _load(numeric_sku_csv / "parts")
+
+    assert streamed.stream_totals["product_quantity"].to_dict() == {"1001": 1025.0, "7": 20.0, "Gizmo": 3.0}
+    assert streamed.calculate_metrics() == expected
+    assert partitioned.calculate_metrics() == expected
+    assert expected["most_popular_product"] == "1001"
+    assert expected["top_category"] == "10"
+
+
+def test_parallel_load_matches_single_read(numeric_sku_csv, monkeypatch):
+    # Ranges of a few hundred bytes so the small file is split several times.
+    monkeypatch.setattr(op, "_byte_ranges", functools.partial(op._byte_ranges, target=300))
+    assert len(op._byte_ranges(str(numeric_sku_csv / "sales.csv"))) > 2
+
+    single = _load(numeric_sku_csv / "sales.csv")
+    parallel = _load(numeric_sku_csv / "sales.csv", workers=2)
+    pd.testing.assert_frame_equal(parallel.data, single.data)
+    assert parallel.calculate_metrics() == single.calculate_metrics()
+
+
+def _sales_frame(rng, rows, start="2024-01-01", days=120):
+    """Random sales rows in shuffled date order with nulls in every column."""
+    frame = pd.DataFrame({
+        "Date": (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit="D")).strftime("%Y-%m-%d"),
+        "Product": rng.choice([f"P{i}" for i in range(15)], rows),
+        "Category": rng.choice(["Toys", "toys", "Books", "Garden"], rows),
+        "Price": rng.uniform(1, 50, rows).round(2),
+        "Quantity Sold": rng.integers(1, 20, rows).astype(float),
+    })
+    for col in frame.columns:
+        frame.loc[rng.random(rows) < 0.04, col] = np.nan
+    return frame
+
+
+def _reference(frame):
+    """What a fresh pandas load of ``frame`` holds: typed columns and Total Sales."""
+    frame = frame.copy()
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    frame["Total Sales"] = frame["Price"] * frame["Quantity Sold"]
+    return frame
+
+
+def _reference_fill(frame):
+    frame = frame.sort_index().copy()
+    numeric = ["Price", "Quantity Sold", "Total Sales"]
+    frame[numeric] = frame[numeric].fillna(frame[numeric].mean())
+    frame["Date"] = frame["Date"].ffill().bfill()
+    frame[["Product", "Category"]] = frame[["Product", "Category"]].fillna("Unknown")
+    return frame
+
+
+def _reference_metrics(frame):
+    if frame.empty:
+        return {}
+    monthly = frame.set_index("Date").resample("M")["Total Sales"].sum()
+    growth = monthly.pct_change().fillna(0).iloc[-1] * 100 if len(monthly) > 1 else 0
+    return {
+        "total_sales": pytest.approx(frame["Total Sales"].sum()),
+        "average_sales": pytest.approx(frame["Total Sales"].mean()),
+        "most_popular_product": frame.groupby("Product")["Quantity Sold"].sum().idxmax(),
+        "top_category": frame.groupby("Category")["Total Sales"].sum().idxmax(),
+        "last_month_growth_pct": pytest.approx(growth),
+    }
+
+
+FILTERS = [
+    (None, None, None),
+    ("toys", None, None),
+    (None, "2024-02-01", "2024-03-15"),
+    ("Books", "2024-01-10", None),
+    ("garden", None, "2024-02-20"),
+    ("unknown", None, None),
+]
+
+
+def _check(analyzer, reference):
+    """Compare the analyzer's incrementally kept state with a pandas recomputation."""
+    data = analyzer.data.sort_index()
+    pd.testing.assert_frame_equal(data, reference.sort_index(), check_dtype=False, check_categorical=False)
+    assert analyzer.null_counts().to_dict() == reference.isna().sum().to_dict()
+
+    for category, start, end in FILTERS:
+        mask = pd.Series(True, index=reference.index)
+        if category:
+            mask &= reference["Category"].str.lower() == category.lower()
+        if start:
+            mask &= reference["Date"] >= pd.Timestamp(start)
+        if end:
+            mask &= reference["Date"] <= pd.Timestamp(end)
+        expected = reference[mask]
+
+        filtered = analyzer.filter_data(category, start, end)
+        assert sorted(filtered.index) == sorted(expected.index)
+        # Computed or served from the cache; either way it must match.
+        assert analyzer.calculate_metrics(filtered) == _reference_metrics(expected)
+    analyzer.filter_data()
+    assert analyzer.calculate_metrics() == _reference_metrics(reference)
+
+
+@pytest.mark.parametrize("rollup", [False, True])
+@pytest.mark.parametrize("steps", [
+    ["fill"],
+    ["drop"],
+    ["append", "fill"],
+    ["append_few", "drop", "append"],
+    ["fill", "append", "drop"],
+    ["append", "append_early", "fill", "drop"],
+])
+def test_incremental_state_matches_recomputation(tmp_path, rollup, steps):
+    rng = np.random.default_rng(len(steps) * 7 + rollup)
+    frame = _sales_frame(rng, 600)
+    frame.to_csv(tmp_path / "base.csv", index=False)
+    analyzer = _load(tmp_path / "base.csv", rollup=rollup)
+    reference = _reference(frame)
+    _check(analyzer, reference)
+
+    for i, step in enumerate(steps):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if step.startswith("append"):
+                rows, start = {"append": (200, "2024-03-01"), "append_few": (10, "2024-04-20"),
+                               "append_early": (150, "2023-12-01")}[step]
+                new = _sales_frame(rng, rows, start=start, days=60)
+                new.to_csv(tmp_path / f"more_{i}.csv", index=False)
+                assert analyzer.append_data(str(tmp_path / f"more_{i}.csv"))
+                new = _reference(new)
+                new.index = new.index + reference.index.max() + 1
+                reference = pd.concat([reference, new])
+            elif step == "fill":
+                analyzer.fill_missing_with_mean()
+                reference = _reference_fill(reference)
+            else:
+                analyzer.drop_missing_rows()
+                reference = reference.dropna()
+        _check(analyzer, reference)
@@ -0,0 +1,243 @@
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Rows parsed per chunk; memory per worker stays proportional to this, not the file.
+STATS_CHUNKSIZE = 500000
+
+# Bytes of CSV body each parallel task parses.
+RANGE_BYTES = 64 * 1024 * 1024
+
+# Rows read up front to decide which columns are numeric.
+SAMPLE_ROWS = 10000
+
+# Relative error of the quantile sketch: reported quantiles are within 1% of a true value.
+SKETCH_ACCURACY = 0.01
+
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so memory
+    grows with the spread of magnitudes rather than with the row count, and
+    two sketches merge by adding bucket counts.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, values):
+        values = values[np.isfinite(values)]
+        self.count += len(values)
+        self.zeros += int(np.count_nonzero(values == 0))
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+
+    def _add_buckets(self, store, magnitudes):
+        if not len(magnitudes):
+            return
+        buckets = np.ceil(np.log(magnitudes) / np.log(self.gamma)).astype(np.int64)
+        keys, counts = np.unique(buckets, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q):
+        if not self.count:
+            return np.nan
+
+        negative = sorted(self.negative, reverse=True)
+        positive = sorted(self.positive)
+        keys = np.array(negative + positive, dtype=np.float64)
+        # Bucket k covers (gamma**(k-1), gamma**k]; this point is within
+        # ``accuracy`` of every value in it.
+        values = 2 * self.gamma ** keys / (self.gamma + 1)
+        values[:len(negative)] *= -1
+        values = np.insert(values, len(negative), 0.0)
+        counts = np.array([self.negative[k] for k in negative] + [self.zeros]
+                          + [self.positive[k] for k in positive])
+
+        # Same rank as pandas' linear interpolation, rounded to a whole value.
+        rank = q * (self.count - 1)
+        return float(values[np.searchsorted(np.cumsum(counts), rank, side="right")])
+
+
+class ColumnStats:
+    """Count, mean, variance, min, max and quantiles of one column, built chunk by chunk.
+
+    Each chunk is reduced on its own and folded in with Chan et al.'s
+    parallel form of Welford's update, which is also how two partial
+    results merge.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.sketch = QuantileSketch(accuracy)
+
+    def add(self, values):
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        mean = values.mean()
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()),
+                      values.min(), values.max())
+        self.sketch.add(values)
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            self.sketch.merge(other.sketch)
+
+    def _combine(self, count, mean, m2, low, high):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = np.fmin(self.min, low)
+        self.max = np.fmax(self.max, high)
+
+    def quantile(self, q):
+        # The sketch's bucket midpoint can overshoot the exact extremes.
+        return float(np.clip(self.sketch.quantile(q), self.min, self.max)) if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+class DatasetStats:
+    """``ColumnStats`` for each numeric column of a dataset; partial results merge."""
+
+    def __init__(self, columns, accuracy=SKETCH_ACCURACY):
+        self.columns = {col: ColumnStats(accuracy) for col in columns}
+        self.rows = 0
+
+    def add_frame(self, frame):
+        self.rows += len(frame)
+        for col, stats in self.columns.items():
+            if col in frame.columns:
+                values = pd.to_numeric(frame[col], errors="coerce")
+                stats.add(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col, stats in other.columns.items():
+            self.columns[col].merge(stats)
+
+    def describe(self, percentiles=DEFAULT_PERCENTILES):
+        """The same table as ``DataFrame.describe()``; percentiles are approximate."""
+        labels = [f"{p * 100:g}%" for p in percentiles]
+        table = {}
+        for col, stats in self.columns.items():
+            table[col] = ([stats.count, stats.mean if stats.count else np.nan, stats.std, stats.min]
+                          + [stats.quantile(p) for p in percentiles] + [stats.max])
+        return pd.DataFrame(table, index=["count", "mean", "std", "min"] + labels + ["max"],
+                            dtype=np.float64)
+
+
+def numeric_columns(file_path, sample_rows=SAMPLE_ROWS):
+    """Numeric (non-boolean) columns of ``file_path``, judged from its first rows."""
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    return [col for col, dtype in sample.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+
+
+def profile_csv(file_path, chunksize=STATS_CHUNKSIZE, workers=1, accuracy=SKETCH_ACCURACY):
+    """Build ``DatasetStats`` for a CSV in one pass without loading it.
+
+    Only the numeric columns are parsed. With ``workers > 1`` the file is
+    split into line-aligned byte ranges that are profiled in separate
+    processes and merged.
+    """
+    columns = numeric_columns(file_path)
+    if workers <= 1:
+        stats = DatasetStats(columns, accuracy)
+        for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunksize):
+            stats.add_frame(chunk)
+        return stats
+
+    header = list(pd.read_csv(file_path, nrows=0).columns)
+    tasks = [(file_path, start, end, header, columns, chunksize, accuracy)
+             for start, end in _byte_ranges(file_path)]
+    stats = DatasetStats(columns, accuracy)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_profile_range, tasks):
+            stats.merge(partial)
+    return stats
+
+
+def _byte_ranges(file_path, target=RANGE_BYTES):
+    """Split a CSV body into ``(start, end)`` byte ranges aligned to line starts.
+
+    Quoted fields containing newlines are not supported.
+    """
+    size = os.path.getsize(file_path)
+    bounds = []
+    with open(file_path, "rb") as f:
+        f.readline()
+        offset = f.tell()
+        while offset < size:
+            bounds.append(offset)
+            f.seek(min(offset + target, size))
+            if f.tell() < size:
+                f.readline()
+            offset = f.tell()
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _profile_range(task):
+    """Worker: profile one byte range of a CSV."""
+    file_path, start, end, header, columns, chunksize, accuracy = task
+    stats = DatasetStats(columns, accuracy)
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        body = f.read(end - start)
+    if body.strip():
+        for chunk in pd.read_csv(io.BytesIO(body), header=None, names=header,
+                                 usecols=columns, chunksize=chunksize):
+            stats.add_frame(chunk)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="One-pass descriptive statistics for large CSVs")
+    parser.add_argument("path")
+    parser.add_argument("--chunksize", type=int, default=STATS_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--accuracy", type=float, default=SKETCH_ACCURACY,
+                        help="relative error of the reported percentiles")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=list(DEFAULT_PERCENTILES))
+    args = parser.parse_args(argv)
+
+    stats = profile_csv(args.path, args.chunksize, args.workers, args.accuracy)
+    print(f"{stats.rows} rows")
+    print(stats.describe(args.percentiles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+# Rows parsed per chunk when a pipeline reads its CSV lazily.
+PIPELINE_CHUNKSIZE = 500000
+
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "&": operator.and_,
+    "|": operator.or_,
+}
+
+
+class Expr:
+    """Column expression recorded for later evaluation.
+
+    Built with ``col`` and ordinary operators, e.g.
+    ``col("Profit") / col("Sales") * 100`` or ``col("Region") == "North"``.
+    The plan optimizer reads ``columns()`` to know what an expression
+    depends on.
+    """
+
+    __hash__ = None
+
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+
+    def columns(self):
+        if self.op == "col":
+            return {self.args[0]}
+        if self.op == "lit":
+            return set()
+        found = set()
+        for arg in self.args:
+            if isinstance(arg, Expr):
+                found |= arg.columns()
+        return found
+
+    def evaluate(self, frame):
+        if self.op == "col":
+            return frame[self.args[0]]
+        if self.op == "lit":
+            return self.args[0]
+        if self.op == "isin":
+            return self.args[0].evaluate(frame).isin(self.args[1])
+        if self.op == "isna":
+            return self.args[0].evaluate(frame).isna()
+        if self.op == "~":
+            return ~self.args[0].evaluate(frame)
+        left, right = (arg.evaluate(frame) for arg in self.args)
+        return _OPERATORS[self.op](left, right)
+
+    def _binary(self, op, other, reverse=False):
+        other = other if isinstance(other, Expr) else lit(other)
+        return Expr(op, (other, self) if reverse else (self, other))
+
+    def __add__(self, other):
+        return self._binary("+", other)
+
+    def __radd__(self, other):
+        return self._binary("+", other, reverse=True)
+
+    def __sub__(self, other):
+        return self._binary("-", other)
+
+    def __rsub__(self, other):
+        return self._binary("-", other, reverse=True)
+
+    def __mul__(self, other):
+        return self._binary("*", other)
+
+    def __rmul__(self, other):
+        return self._binary("*", other, reverse=True)
+
+    def __truediv__(self, other):
+        return self._binary("/", other)
+
+    def __rtruediv__(self, other):
+        return self._binary("/", other, reverse=True)
+
+    def __gt__(self, other):
+        return self._binary(">", other)
+
+    def __ge__(self, other):
+        return self._binary(">=", other)
+
+    def __lt__(self, other):
+        return self._binary("<", other)
+
+    def __le__(self, other):
+        return self._binary("<=", other)
+
+    def __eq__(self, other):
+        return self._binary("==", other)
+
+    def __ne__(self, other):
+        return self._binary("!=", other)
+
+    def __and__(self, other):
+        return self._binary("&", other)
+
+    def __or__(self, other):
+        return self._binary("|", other)
+
+    def __invert__(self):
+        return Expr("~", (self,))
+
+    def isin(self, values):
+        return Expr("isin", (self, list(values)))
+
+    def isna(self):
+        return Expr("isna", (self,))
+
+    def __repr__(self):
+        if self.op == "col":
+            return f"col({self.args[0]!r})"
+        if self.op == "lit":
+            return repr(self.args[0])
+        if self.op == "isin":
+            return f"{self.args[0]!r}.isin({self.args[1]!r})"
+        if self.op == "isna":
+            return f"{self.args[0]!r}.isna()"
+        if self.op == "~":
+            return f"~{self.args[0]!r}"
+        return f"({self.args[0]!r} {self.op} {self.args[1]!r})"
+
+
+def col(name):
+    return Expr("col", (name,))
+
+
+def lit(value):
+    return Expr("lit", (value,))
+
+
+def fill_value(frame, value):
+    """``frame.fillna(value)`` that first adds ``value`` to categorical columns."""
+    frame = frame.copy(deep=False)
+    for name in frame.select_dtypes(include="category").columns:
+        if value not in frame[name].cat.categories:
+            frame[name] = frame[name].cat.add_categories(value)
+    return frame.fillna(value)
+
+
+def optimize(steps):
+    """Rewrite a recorded plan so it does the same work in fewer passes.
+
+    - Filters move ahead of derived columns they do not read and of
+      ``dropna`` (both keep or drop whole rows), so later steps touch
+      fewer rows. They never move past fills, which change values.
+    - Adjacent filters merge into one mask, so rows are taken once.
+    - Adjacent derived columns fuse into one step evaluated together.
+    """
+    plan = []
+    for step in steps:
+        kind = step[0]
+        if kind == "filter":
+            position = len(plan)
+            while position and _can_pass(step[1], plan[position - 1]):
+                position -= 1
+            if position and plan[position - 1][0] == "filter":
+                merged = ("filter", plan[position - 1][1] & step[1])
+                plan[position - 1] = merged
+            else:
+                plan.insert(position, step)
+        elif kind == "derive" and plan and plan[-1][0] == "derive":
+            plan[-1] = ("derive", plan[-1][1] + step[1])
+        else:
+            plan.append(step)
+    return plan
+
+
+def _can_pass(predicate, step):
+    if step[0] == "dropna":
+        return True
+    if step[0] == "derive":
+        return not predicate.columns() & {name for name, _ in step[1]}
+    return False
+
+
+def _execute(frame, plan, means=None):
+    """Run an optimized plan over one frame or chunk.
+
+    ``means`` maps a ``fill_mean`` step's position to the column means to
+    use; without it they come from the frame itself.
+    """
+    for position, step in enumerate(plan):
+        kind = step[0]
+        if kind == "filter":
+            mask = step[1].evaluate(frame)
+            frame = frame[np.asarray(mask, dtype=bool)]
+        elif kind == "derive":
+            # New columns on a shallow copy leave the input frame alone.
+            frame = frame.copy(deep=False)
+            for name, expr in step[1]:
+                frame[name] = expr.evaluate(frame)
+        elif kind == "dropna":
+            frame = frame.dropna()
+        elif kind == "fill_mean":
+            column_means = means[position] if means is not None else frame.mean(numeric_only=True)
+            frame = frame.fillna(column_means)
+        elif kind == "fill_value":
+            frame = fill_value(frame, step[1])
+    return frame
+
+
+class Pipeline:
+    """Lazily recorded filters, derived columns and cleaning steps.
+
+    Nothing runs until ``collect()``. The plan is optimized first (see
+    ``optimize``) and then run in one pass over the source. For a CSV
+    source the pass goes chunk by chunk, so only surviving rows are kept;
+    each ``fill_mean`` costs one extra streaming pass to find its means.
+    """
+
+    def __init__(self, source, steps=None, chunksize=PIPELINE_CHUNKSIZE, read_options=None):
+        self.source = source
+        self.steps = list(steps or [])
+        self.chunksize = chunksize
+        self.read_options = dict(read_options or {})
+
+    @classmethod
+    def scan_csv(cls, file_path, chunksize=PIPELINE_CHUNKSIZE, **read_options):
+        return cls(file_path, chunksize=chunksize, read_options=read_options)
+
+    def _then(self, step):
+        return Pipeline(self.source, self.steps + [step], self.chunksize, self.read_options)
+
+    def filter(self, predicate):
+        return self._then(("filter", predicate))
+
+    def with_column(self, name, expr):
+        return self._then(("derive", [(name, expr)]))
+
+    def dropna(self):
+        return self._then(("dropna",))
+
+    def fill_mean(self):
+        return self._then(("fill_mean",))
+
+    def fill_value(self, value):
+        return self._then(("fill_value", value))
+
+    def explain(self):
+        lines = []
+        for step in optimize(self.steps):
+            if step[0] == "filter":
+                lines.append(f"filter {step[1]!r}")
+            elif step[0] == "derive":
+                lines.append("derive " + ", ".join(f"{name} = {expr!r}" for name, expr in step[1]))
+            elif step[0] == "fill_value":
+                lines.append(f"fill_value {step[1]!r}")
+            else:
+                lines.append(step[0])
+        return "\n".join(lines)
+
+    def collect(self):
+        plan = optimize(self.steps)
+        if isinstance(self.source, pd.DataFrame):
+            return _execute(self.source, plan)
+
+        means = {}
+        for position, step in enumerate(plan):
+            if step[0] == "fill_mean":
+                means[position] = self._stream_means(plan[:position], means)
+        parts = [_execute(chunk, plan, means) for chunk in self._chunks()]
+        return pd.concat(parts) if parts else pd.read_csv(self.source, nrows=0, **self.read_options)
+
+    def _chunks(self):
+        return pd.read_csv(self.source, chunksize=self.chunksize, **self.read_options)
+
+    def _stream_means(self, prefix, means):
+        """Column means of the rows that come out of ``prefix``, in one streaming pass."""
+        sums = counts = None
+        for chunk in self._chunks():
+            chunk = _execute(chunk, prefix, means)
+            chunk_sums = chunk.sum(numeric_only=True)
+            chunk_counts = chunk[chunk_sums.index].count()
+            sums = chunk_sums if sums is None else sums.add(chunk_sums, fill_value=0)
+            counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+        if sums is None:
+            return pd.Series(dtype=np.float64)
+        return sums / counts
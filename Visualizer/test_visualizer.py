@@ -0,0 +1,108 @@
+import json
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from visualizer import DENSITY_BINS, SCHEMA_FILE, SalesDataAnalyzer, compute_rollup
+
+
+def _write(path, dates):
+    pd.DataFrame({
+        "Date": dates,
+        "Region": ["North", "South"] * (len(dates) // 2),
+        "Sales": range(len(dates)),
+    }).to_csv(path, index=False)
+
+
+def test_family_with_another_date_format(tmp_path):
+    _write(tmp_path / "sales_1.csv", ["2024-01-31", "2024-02-29", "2024-03-15", "2024-04-30"])
+    _write(tmp_path / "sales_2.csv", ["31/01/2024", "29/02/2024", "15/03/2024", "30/04/2024"])
+
+    analyzer = SalesDataAnalyzer(str(tmp_path / "sales_1.csv"))
+    assert analyzer.data["Date"].notna().all()
+
+    analyzer.load_data(str(tmp_path / "sales_2.csv"))
+    dates = analyzer.data["Date"]
+    assert pd.api.types.is_datetime64_any_dtype(dates)
+    assert list(dates) == list(pd.to_datetime(["2024-01-31", "2024-02-29", "2024-03-15", "2024-04-30"]))
+
+    # The family schema now holds the format that fits the newer file.
+    with open(os.path.join(tmp_path, SCHEMA_FILE)) as f:
+        assert json.load(f)["sales_#.csv"]["dates"]["Date"] != "ISO8601"
+
+
+def test_family_date_column_without_dates_stays_text(tmp_path, capsys):
+    _write(tmp_path / "sales_1.csv", ["2024-01-31", "2024-02-29", "2024-03-15", "2024-04-30"])
+    _write(tmp_path / "sales_2.csv", ["soon", "later", "never", "tbd"])
+
+    SalesDataAnalyzer(str(tmp_path / "sales_1.csv"))
+    analyzer = SalesDataAnalyzer(str(tmp_path / "sales_2.csv"))
+
+    assert list(analyzer.data["Date"]) == ["soon", "later", "never", "tbd"]
+    assert "kept as text" in capsys.readouterr().out
+
+
+def test_plots_of_different_axis_types_in_one_session(tmp_path, monkeypatch):
+    _write(tmp_path / "sales_1.csv", ["2024-01-31", "2024-02-29", "2024-03-15", "2024-04-30"])
+    analyzer = SalesDataAnalyzer(str(tmp_path / "sales_1.csv"))
+
+    for binned in (False, True):
+        answers = iter(["1", "Region", "Sales", "2", "Date", "Sales", "6"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+        analyzer.visualize_data(binned=binned)
+    plt.close("all")
+
+
+def test_mean_by_bins_many_distinct_values():
+    analyzer = SalesDataAnalyzer()
+    analyzer.data = pd.DataFrame({
+        "Price": np.arange(1000.0),
+        "Date": pd.date_range("2024-01-01", periods=1000, freq="h"),
+        "Units": np.arange(1000) % 3,
+        "Sales": np.ones(1000),
+    })
+
+    for x in ("Price", "Date"):
+        means = analyzer._mean_by(x, "Sales")
+        assert isinstance(means.index, pd.IntervalIndex)
+        assert len(means) == DENSITY_BINS
+        assert (means == 1.0).all()
+
+    # Few distinct values keep one group per value.
+    assert list(analyzer._mean_by("Units", "Sales").index) == [0, 1, 2]
+
+
+def test_rollup_with_more_key_combinations_than_int64():
+    # 2000 distinct values in each of six keys: 2000 ** 6 > 2 ** 63.
+    rng = np.random.default_rng(0)
+    keys = [f"k{i}" for i in range(6)]
+    data = pd.DataFrame({key: rng.permutation(2000) for key in keys})
+    data["Sales"] = np.arange(2000.0)
+
+    cube = compute_rollup(data, keys, measures=("Sales",))
+    expected = data.groupby(keys, sort=False)["Sales"].sum().reset_index()
+    assert len(cube) == 2000
+    pd.testing.assert_frame_equal(cube[keys + ["Sales sum"]].set_axis(keys + ["Sales"], axis=1), expected,
+                                  check_dtype=False)
+
+
+def test_cache_keeps_schema_and_raw_reads_of_one_file(tmp_path):
+    path = str(tmp_path / "sales_1.csv")
+    _write(path, ["2024-01-31", "2024-02-29", "2024-03-15", "2024-04-30"])
+    analyzer = SalesDataAnalyzer()
+    for use_schema in (True, False, True, False):
+        analyzer.load_data(path, use_schema=use_schema)
+    assert (analyzer.cache.hits, analyzer.cache.misses) == (2, 2)
+
+    # A rewritten file replaces only its own stale entries.
+    _write(path, ["2024-05-31", "2024-06-30"])
+    os.utime(path, ns=(0, 0))
+    analyzer.load_data(path)
+    assert analyzer.cache.stats()["datasets"] == 2
+    assert list(analyzer.data["Date"].dt.month) == [5, 6]
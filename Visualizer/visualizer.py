@@ -1,27 +1,532 @@
+import importlib.util
+import json
+import math
+import os
+import re
+import warnings
+import weakref
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from column_stats import profile_csv
+from pipeline import Pipeline, col, fill_value
+
+# Rows read from the top of a file to infer its schema.
+SCHEMA_SAMPLE_ROWS = 10000
+
+# Text columns with at most this share of distinct values load as categoricals.
+CATEGORY_MAX_RATIO = 0.5
+
+# Share of sampled values that must parse as dates for a column to load as datetime.
+DATE_MIN_PARSED = 0.9
+
+# Written next to the data: the inferred schema of each file family in that folder.
+SCHEMA_FILE = ".schemas.json"
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# From this many rows on, visualize_data aggregates before drawing instead
+# of handing every row to seaborn.
+BINNED_MIN_ROWS = 50000
+
+# Bins per axis of the density plot that replaces a large scatter plot.
+DENSITY_BINS = 200
+
+HISTOGRAM_BINS = 10
+
+# A binned pie chart shows this many slices; smaller groups become "Other".
+PIE_MAX_SLICES = 10
+
+# Categorical axes with more values than this are left without tick labels.
+MAX_TICK_LABELS = 50
+
+# Memory the session dataset cache may hold before evicting the least
+# recently used frame. The open dataset is cached too and counts toward it.
+CACHE_BUDGET_BYTES = 1024 ** 3
+
+# Columns a rollup aggregates by default; "Profit Margin %" needs both.
+ROLLUP_MEASURES = ("Sales", "Profit")
+
+# Rollups with at most this many possible key combinations count into
+# dense arrays; larger ones compact their group ids with a hash first.
+ROLLUP_DENSE_MAX_CELLS = 1000000
+
+
+def file_family(file_path):
+    """Files whose names differ only in digits share a schema (sales_2024_01.csv -> sales_#_#.csv)."""
+    return re.sub(r"\d+", "#", os.path.basename(file_path))
+
+
+def infer_schema(sample):
+    """Pick dtypes, date columns and categoricals from a sample frame."""
+    dtypes = {}
+    dates = {}
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            dtypes[col] = "int64"
+        elif pd.api.types.is_float_dtype(series):
+            dtypes[col] = "float64"
+        elif pd.api.types.is_object_dtype(series):
+            values = series.dropna()
+            if values.empty:
+                continue
+            date_format = _date_format(values)
+            if date_format is not False:
+                dates[col] = date_format
+            elif values.nunique() <= CATEGORY_MAX_RATIO * len(values):
+                dtypes[col] = "category"
+    return {"columns": list(sample.columns), "dtypes": dtypes, "dates": dates}
+
+
+def _date_format(values):
+    """``"ISO8601"``, ``None`` (let pandas infer) or ``False`` when ``values`` are not dates."""
+    for date_format in ("ISO8601", None):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+            except (ValueError, TypeError):
+                continue
+        if parsed.notna().mean() >= DATE_MIN_PARSED:
+            return date_format
+    return False
+
+
+def _parse_dates(values, date_format):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pd.to_datetime(values, format=date_format, errors="coerce")
+
+
+def _load_schemas(directory):
+    try:
+        with open(os.path.join(directory, SCHEMA_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_schemas(directory, schemas):
+    try:
+        with open(os.path.join(directory, SCHEMA_FILE), "w") as f:
+            json.dump(schemas, f, indent=1)
+    except OSError as e:
+        print(f"Could not save schema: {e}")
+
+
+def _read_csv_fast(file_path, dtypes):
+    """Read with pyarrow when it is installed, else with the C parser."""
+    if HAS_PYARROW:
+        try:
+            return pd.read_csv(file_path, dtype=dtypes, engine="pyarrow")
+        except ValueError:
+            pass
+    return pd.read_csv(file_path, dtype=dtypes)
+
+
+def _axis_values(series):
+    """Float positions for plotting ``series``, its category labels and whether it holds dates."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return mdates.date2num(series.to_numpy()), None, True
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan), None, False
+    codes, labels = pd.factorize(series, sort=True)
+    values = codes.astype(np.float64)
+    values[codes < 0] = np.nan
+    return values, [str(label) for label in labels], False
+
+
+def _axis_bins(labels, bins):
+    """One bin per category on a categorical axis, else ``bins`` even bins."""
+    return bins if labels is None else np.arange(len(labels) + 1) - 0.5
+
+
+def _format_axis(axis, labels, is_date):
+    if is_date:
+        axis.axis_date()
+    elif labels is not None and len(labels) <= MAX_TICK_LABELS:
+        axis.set_ticks(range(len(labels)), labels)
+
+
+def draw_density(x, y, bins=DENSITY_BINS):
+    """2-D histogram of ``x`` against ``y`` in place of a scatter plot.
+
+    Drawing cost follows the number of bins, not the number of rows.
+    """
+    x_values, x_labels, x_dates = _axis_values(x)
+    y_values, y_labels, y_dates = _axis_values(y)
+    keep = ~(np.isnan(x_values) | np.isnan(y_values))
+    counts, x_edges, y_edges = np.histogram2d(
+        x_values[keep], y_values[keep], bins=(_axis_bins(x_labels, bins), _axis_bins(y_labels, bins)))
+
+    mesh = plt.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+    plt.colorbar(mesh, label="Rows")
+    ax = plt.gca()
+    _format_axis(ax.xaxis, x_labels, x_dates)
+    _format_axis(ax.yaxis, y_labels, y_dates)
+    plt.xlabel(x.name)
+    plt.ylabel(y.name)
+
+
+def draw_aggregated(kind, means, x, y):
+    """Bar or line plot of ``means`` (mean ``y`` per ``x`` value or bin), aggregated before drawing."""
+    index = means.index
+    if isinstance(index, pd.IntervalIndex):
+        left, _, is_date = _axis_values(pd.Series(index.left))
+        right = _axis_values(pd.Series(index.right))[0]
+        if kind == "bar":
+            plt.bar(left, means.to_numpy(), width=right - left, align="edge")
+        else:
+            plt.plot((left + right) / 2, means.to_numpy())
+        _format_axis(plt.gca().xaxis, None, is_date)
+    elif kind == "bar":
+        positions = np.arange(len(means))
+        plt.bar(positions, means.to_numpy())
+        if len(means) <= MAX_TICK_LABELS:
+            plt.xticks(positions, [str(value) for value in index])
+    else:
+        if not (pd.api.types.is_numeric_dtype(index) or pd.api.types.is_datetime64_any_dtype(index)):
+            index = index.astype(str)
+        plt.plot(index, means.to_numpy())
+    plt.xlabel(x)
+    plt.ylabel(y)
+
+
+def draw_histogram(series, bins=HISTOGRAM_BINS):
+    """Histogram from ``np.histogram`` counts; only the bins are drawn."""
+    values, labels, is_date = _axis_values(series)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=_axis_bins(labels, bins))
+    plt.stairs(counts, edges, fill=True)
+    _format_axis(plt.gca().xaxis, labels, is_date)
+
+
+def draw_pie(counts, max_slices=None):
+    # Categoricals also count categories with no rows.
+    counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+    if max_slices is not None and len(counts) > max_slices:
+        other = pd.Series({"Other": counts.iloc[max_slices - 1:].sum()})
+        counts = pd.concat([counts.iloc[:max_slices - 1], other])
+    counts.plot.pie(autopct="%1.1f%%")
+
+
+def _key_codes(series):
+    """Integer codes (-1 for missing) and labels of a group key, without sorting."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, labels = pd.factorize(series, sort=False)
+    return codes, pd.Index(labels)
+
+
+def compute_rollup(data, keys, period=None, measures=ROLLUP_MEASURES, date_column="Date"):
+    """Sum, mean and count of ``measures`` per combination of ``keys`` (and period).
+
+    Each key becomes integer codes (categorical codes as they are, other
+    columns hashed with ``pd.factorize``), the codes combine into one group
+    id, and every aggregate is a ``np.bincount`` over it, so nothing is
+    sorted. ``period`` is a pandas period alias ("M", "Q", ...) applied to
+    ``date_column``. Rows with a missing key are left out, as in
+    ``groupby``. With both Sales and Profit, "Profit Margin %" is added.
+    """
+    names = list(keys)
+    key_series = [data[name] for name in keys]
+    if period:
+        names.append("Period")
+        key_series.append(data[date_column].dt.to_period(period))
+
+    codes, labels = zip(*(_key_codes(series) for series in key_series))
+    sizes = [len(label) for label in labels]
+    valid = np.ones(len(data), dtype=bool)
+    for code in codes:
+        valid &= code >= 0
+    codes = [code[valid] for code in codes]
+
+    group = np.zeros(np.count_nonzero(valid), dtype=np.int64)
+    span = 1
+    for code, size in zip(codes, sizes):
+        if span * size >= 2 ** 63:
+            # The combined id would overflow int64: number the combinations
+            # seen so far (at most one per row) and continue from those.
+            group, seen = pd.factorize(group, sort=False)
+            span = len(seen)
+        group = group * size + code
+        span *= size
+
+    cells = math.prod(sizes)
+    result = {}
+    if cells <= ROLLUP_DENSE_MAX_CELLS:
+        dense, n_groups = group, cells
+        rows = np.bincount(dense, minlength=n_groups)
+        occupied = np.flatnonzero(rows)
+        cell = occupied
+        for name, label, size in reversed(list(zip(names, labels, sizes))):
+            cell, code = np.divmod(cell, size)
+            result[name] = label.take(code)
+        result = {name: result[name] for name in names}
+    else:
+        dense, cell_ids = pd.factorize(group, sort=False)
+        n_groups = len(cell_ids)
+        rows = np.bincount(dense, minlength=n_groups)
+        occupied = np.arange(n_groups)
+        # Every group has rows; read its keys from the first of them.
+        first = np.empty(n_groups, dtype=np.intp)
+        first[dense[::-1]] = np.arange(len(dense) - 1, -1, -1)
+        for name, label, code in zip(names, labels, codes):
+            result[name] = label.take(code[first])
+
+    sums = {}
+    for measure in measures:
+        values = data[measure].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        present = ~np.isnan(values)
+        total = np.bincount(dense, weights=np.where(present, values, 0.0), minlength=n_groups)[occupied]
+        count = np.bincount(dense[present], minlength=n_groups)[occupied]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[f"{measure} sum"] = total
+            result[f"{measure} mean"] = total / count
+        result[f"{measure} count"] = count
+        sums[measure] = total
+    result["Rows"] = rows[occupied]
+    if "Sales" in sums and "Profit" in sums:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result["Profit Margin %"] = sums["Profit"] / sums["Sales"] * 100
+    return pd.DataFrame(result)
+
+
+class DatasetCache:
+    """Loaded frames kept for the session, keyed by path and file modification.
+
+    Least recently used frames are evicted once their combined
+    ``memory_usage(deep=True)`` exceeds ``budget_bytes``. Frames are shared,
+    not copied, so callers must not modify them in place.
+    """
+
+    def __init__(self, budget_bytes=CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(file_path, use_schema=True):
+        st = os.stat(file_path)
+        return (os.path.abspath(file_path), st.st_mtime_ns, st.st_size, use_schema)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, key, frame, schema=None):
+        # Older versions of the same file (read the same way) can never be hit again.
+        path, _, _, use_schema = key
+        for old in [k for k in self._entries if k[0] == path and k[3] == use_schema and k != key]:
+            self._remove(old)
+
+        nbytes = int(frame.memory_usage(deep=True).sum())
+        if nbytes > self.budget_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        while self._entries and self.used_bytes + nbytes > self.budget_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = (frame, schema, nbytes)
+        self.used_bytes += nbytes
+
+    def _remove(self, key):
+        self.used_bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "datasets": len(self._entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+
 class SalesDataAnalyzer:
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, lazy=False, cache_budget_bytes=CACHE_BUDGET_BYTES):
         self.data = None
         self.last_plot = None
+        self.schema = None
+        # With ``lazy`` on, operations and cleaning steps are queued in
+        # ``self.pipeline`` and run together when the data is next shown.
+        self.lazy = lazy
+        self.pipeline = None
+        # Frames handed out by the cache are shared with it, so every
+        # operation below replaces ``self.data`` rather than editing it.
+        self.cache = DatasetCache(cache_budget_bytes)
+        self._rollups = {}
+        self._rollup_source = None
         if file_path:
             self.load_data(file_path)
 
-    def load_data(self, file_path):
+    def load_data(self, file_path, use_schema=True):
         try:
-            self.data = pd.read_csv(file_path)
-            print("Dataset loaded successfully!")
+            key = self.cache.key(file_path, use_schema)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.data, self.schema = cached
+            elif use_schema:
+                self.data = self._read_with_schema(file_path)
+                self.cache.put(key, self.data, self.schema)
+            else:
+                self.data = pd.read_csv(file_path)
+                self.schema = None
+                self.cache.put(key, self.data)
+            self.pipeline = None
+            print("Dataset loaded successfully!" if cached is None else "Dataset loaded from session cache!")
         except FileNotFoundError:
             print("File not found. Please check the path and try again.")
 
+    def _read_with_schema(self, file_path):
+        """Read ``file_path`` with explicit dtypes instead of letting pandas guess.
+
+        The schema is inferred from the first ``SCHEMA_SAMPLE_ROWS`` rows the
+        first time a file family is seen and saved in ``SCHEMA_FILE``, so
+        later files of the family skip the sampling. It is re-inferred when
+        the header changes or the rest of the file does not fit it, and a
+        date column's format when too few of its values parse with it.
+        """
+        header = list(pd.read_csv(file_path, nrows=0).columns)
+        directory = os.path.dirname(os.path.abspath(file_path))
+        family = file_family(file_path)
+        schemas = _load_schemas(directory)
+
+        schema = schemas.get(family)
+        if schema is None or schema["columns"] != header:
+            schema = infer_schema(pd.read_csv(file_path, nrows=SCHEMA_SAMPLE_ROWS))
+            schemas[family] = schema
+            _save_schemas(directory, schemas)
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                df = _read_csv_fast(file_path, schema["dtypes"])
+        except (ValueError, TypeError):
+            # The sample did not represent the file (e.g. blanks further down
+            # an integer column), so infer again from all of it.
+            df = pd.read_csv(file_path)
+            schema = infer_schema(df)
+            for col, dtype in schema["dtypes"].items():
+                df[col] = df[col].astype(dtype)
+            schemas[family] = schema
+            _save_schemas(directory, schemas)
+
+        for col, date_format in list(schema["dates"].items()):
+            values = df[col]
+            parsed = _parse_dates(values, date_format)
+            if parsed.notna().sum() < DATE_MIN_PARSED * values.notna().sum():
+                # Another file of the family writes its dates differently.
+                date_format = _date_format(values.dropna())
+                if date_format is False:
+                    print(f"Column '{col}' of {os.path.basename(file_path)} does not parse as dates; "
+                          "kept as text.")
+                    continue
+                parsed = _parse_dates(values, date_format)
+                schema["dates"][col] = date_format
+                schemas[family] = schema
+                _save_schemas(directory, schemas)
+            df[col] = parsed
+        self.schema = schema
+        return df
+
+    def rollup(self, keys=("Region", "Product"), period=None, measures=None):
+        """Cached ``compute_rollup`` of the current data.
+
+        Results are reused by the statistics and plotting menus until
+        ``self.data`` is replaced, which every operation here does instead
+        of editing it in place.
+        """
+        self.collect()
+        if self._rollup_source is None or self._rollup_source() is not self.data:
+            self._rollups = {}
+            self._rollup_source = weakref.ref(self.data)
+
+        if measures is None:
+            measures = [m for m in ROLLUP_MEASURES if m in self.data.columns]
+        key = (tuple(keys), period, tuple(measures))
+        if key not in self._rollups:
+            self._rollups[key] = compute_rollup(self.data, keys, period, measures)
+        return self._rollups[key]
+
+    def _mean_by(self, x, y):
+        """Mean ``y`` per ``x`` value, from the rollup cache when ``y`` is numeric.
+
+        Numeric and date ``x`` with more than ``DENSITY_BINS`` distinct values
+        is cut into that many even bins first; the result is then indexed by
+        an ``IntervalIndex`` of the non-empty bins.
+        """
+        keys = self.data[x]
+        is_date = pd.api.types.is_datetime64_any_dtype(keys)
+        if ((is_date or pd.api.types.is_numeric_dtype(keys) and not pd.api.types.is_bool_dtype(keys))
+                and keys.nunique() > DENSITY_BINS):
+            if is_date:
+                values = np.where(keys.isna(), np.nan, keys.to_numpy(dtype="datetime64[ns]").view(np.int64))
+            else:
+                values = keys.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+            edges = np.histogram_bin_edges(values[present], bins=DENSITY_BINS)
+            # The last bin also holds the maximum.
+            codes = np.minimum(np.searchsorted(edges, values[present], side="right") - 1, DENSITY_BINS - 1)
+            means = self.data[y][present].groupby(codes).mean()
+            bins = pd.IntervalIndex.from_breaks(pd.to_datetime(edges) if is_date else edges, closed="left", name=x)
+            means.index = bins[means.index]
+            return means
+        if x != y and pd.api.types.is_numeric_dtype(self.data[y]):
+            cube = self.rollup((x,), measures=(y,))
+            return pd.Series(cube[f"{y} mean"].to_numpy(), index=cube[x], name=y).sort_index()
+        return self.data.groupby(x, observed=True)[y].mean()
+
+    def _queue(self, step, *args):
+        pipeline = self.pipeline if self.pipeline is not None else Pipeline(self.data)
+        self.pipeline = getattr(pipeline, step)(*args)
+
+    def collect(self):
+        """Run the queued steps, optimized as one plan, into ``self.data``."""
+        if self.pipeline is not None:
+            self.data = self.pipeline.collect()
+            self.pipeline = None
+
+    def filter_rows(self, predicate):
+        """Keep rows matching an expression, e.g. ``col("Region") == "North"``."""
+        if self.data is None:
+            print("No dataset loaded.")
+            return
+        if self.lazy:
+            self._queue("filter", predicate)
+        else:
+            self.data = self.data[np.asarray(predicate.evaluate(self.data), dtype=bool)]
+
     
     def explore_data(self):
         if self.data is None:
             print("No dataset loaded.")
             return
+        self.collect()
         
         while True:
             print("\n== Explore Data ==")
@@ -55,7 +560,11 @@ class SalesDataAnalyzer:
             print("No dataset loaded.")
             return
         if 'Sales' in self.data.columns and 'Profit' in self.data.columns:
-            self.data['Profit Margin %'] = (self.data['Profit'] / self.data['Sales']) * 100
+            if self.lazy:
+                self._queue("with_column", 'Profit Margin %', col('Profit') / col('Sales') * 100)
+            else:
+                self.data = self.data.copy(deep=False)
+                self.data['Profit Margin %'] = (self.data['Profit'] / self.data['Sales']) * 100
             print("Added new column 'Profit Margin %'")
         else:
             print("Columns 'Sales' or 'Profit' not found")
@@ -77,6 +586,7 @@ class SalesDataAnalyzer:
             choice = input("Enter your choice: ")
 
             if choice == '1':
+                self.collect()
                 missing = self.data[self.data.isnull().any(axis=1)]
                 if missing.empty:
                     print("No missing values!")
@@ -84,16 +594,25 @@ class SalesDataAnalyzer:
                     print(missing)
 
             elif choice == '2':
-                self.data.fillna(self.data.mean(numeric_only=True), inplace=True)
+                if self.lazy:
+                    self._queue("fill_mean")
+                else:
+                    self.data = self.data.fillna(self.data.mean(numeric_only=True))
                 print("Missing values filled with mean.")
 
             elif choice == '3':
-                self.data.dropna(inplace=True)
+                if self.lazy:
+                    self._queue("dropna")
+                else:
+                    self.data = self.data.dropna()
                 print("Rows with missing values dropped.")
 
             elif choice == '4':
                 value = input("Enter replacement value: ")
-                self.data.fillna(value, inplace=True)
+                if self.lazy:
+                    self._queue("fill_value", value)
+                else:
+                    self.data = fill_value(self.data, value)
                 print("Missing values replaced.")
 
             elif choice == '5':
@@ -102,19 +621,49 @@ class SalesDataAnalyzer:
                 print("Invalid choice!")
 
     
-    def descriptive_statistics(self):
+    def descriptive_statistics(self, file_path=None, workers=1):
+        """Describe the loaded data, or profile ``file_path`` in one pass without loading it.
+
+        Profiling streams the file in chunks, so memory does not grow with
+        its size; its percentiles are approximate (see ``column_stats``).
+        """
+        if file_path:
+            try:
+                stats = profile_csv(file_path, workers=workers)
+            except FileNotFoundError:
+                print("File not found. Please check the path and try again.")
+                return
+            print(f"\n--- Descriptive Statistics ({stats.rows} rows, one pass) ---")
+            print(stats.describe())
+            return
+
         if self.data is None:
             print("No dataset loaded.")
             return
+        self.collect()
         
         print("\n--- Descriptive Statistics ---")
         print(self.data.describe())
 
+        keys = [k for k in ("Region", "Product") if k in self.data.columns]
+        if keys and any(m in self.data.columns for m in ROLLUP_MEASURES):
+            print(f"\n--- Rollup by {' x '.join(keys)} ---")
+            print(self.rollup(keys))
+
     
-    def visualize_data(self):
+    def visualize_data(self, binned=None):
+        """Plot menu. ``binned`` aggregates before drawing; by default it is on
+        from ``BINNED_MIN_ROWS`` rows, where seaborn would draw or bootstrap
+        every row.
+        """
         if self.data is None:
             print("No dataset loaded.")
             return
+        self.collect()
+        if binned is None:
+            binned = len(self.data) >= BINNED_MIN_ROWS
+        if binned:
+            print("Large dataset: plots are aggregated before drawing.")
         
         while True:
             print("\n== Data Visualization ==")
@@ -126,29 +675,46 @@ class SalesDataAnalyzer:
             print("6. Back to Main Menu")
 
             choice = input("Enter your choice: ")
+            if choice in ('1', '2', '3', '4', '5'):
+                # Each plot gets its own figure; reusing the axes mixes units across plots.
+                plt.figure()
 
             if choice == '1':
                 x = input("Enter X column: ")
                 y = input("Enter Y column: ")
-                sns.barplot(data=self.data, x=x, y=y)
+                if binned:
+                    draw_aggregated("bar", self._mean_by(x, y), x, y)
+                else:
+                    sns.barplot(data=self.data, x=x, y=y)
             
             elif choice == '2':
                 x = input("Enter X column: ")
                 y = input("Enter Y column: ")
-                sns.lineplot(data=self.data, x=x, y=y)
+                if binned:
+                    draw_aggregated("line", self._mean_by(x, y), x, y)
+                else:
+                    sns.lineplot(data=self.data, x=x, y=y)
 
             elif choice == '3':
                 x = input("Enter X column: ")
                 y = input("Enter Y column: ")
-                sns.scatterplot(data=self.data, x=x, y=y)
+                if binned:
+                    draw_density(self.data[x], self.data[y])
+                else:
+                    sns.scatterplot(data=self.data, x=x, y=y)
 
             elif choice == '4':
                 column = input("Enter column for pie chart grouping: ")
-                self.data[column].value_counts().plot.pie(autopct="%1.1f%%")
+                cube = self.rollup((column,), measures=())
+                counts = pd.Series(cube["Rows"].to_numpy(), index=cube[column], name="count")
+                draw_pie(counts, PIE_MAX_SLICES if binned else None)
             
             elif choice == '5':
                 column = input("Enter column for histogram: ")
-                plt.hist(self.data[column], bins=10)
+                if binned:
+                    draw_histogram(self.data[column])
+                else:
+                    plt.hist(self.data[column], bins=HISTOGRAM_BINS)
 
             elif choice == '6':
                 break
@@ -199,7 +765,10 @@ def main():
         elif choice == '4':
             analyzer.clean_data()
         elif choice == '5':
-            analyzer.descriptive_statistics()
+            path = None
+            if analyzer.data is None:
+                path = input("Enter CSV path to profile without loading (blank to cancel): ").strip()
+            analyzer.descriptive_statistics(path)
         elif choice == '6':
             analyzer.visualize_data()
         elif choice == '7':
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import Analyzer
+from Analyzer import ChunkedArray, load_array, median, moments, quantile
+
+INFINITE_CASES = [
+    [1.0, np.inf],
+    [-np.inf, 1.0],
+    [-np.inf, np.inf],
+    [np.inf, np.inf],
+    [-np.inf, -np.inf],
+    [-np.inf, 1.0, np.inf],
+    [-np.inf, 1.0, 2.0, np.inf],
+    [1e308, 1.5e308],
+    list(np.linspace(-1, 1, 1001)) + [np.inf] * 600,
+    list(np.linspace(-1, 1, 1000)) + [-np.inf] * 600 + [np.inf] * 3,
+]
+
+
+@pytest.fixture(autouse=True)
+def few_candidates(monkeypatch):
+    # Small enough that the histogram passes run, not just np.partition.
+    monkeypatch.setattr(Analyzer, "SELECT_MAX_CANDIDATES", 64)
+
+
+@pytest.mark.parametrize("values", INFINITE_CASES)
+def test_median_with_infinities_matches_numpy(values):
+    array = np.array(values)
+    with np.errstate(all="ignore"):
+        expected = np.median(array)
+    for data in (array, ChunkedArray([array[:1], array[1:]])):
+        assert np.array_equal(median(data)[0], expected, equal_nan=True)
+        value, error = median(data, exact=False)
+        assert value == expected or abs(value - expected) <= error or np.isnan(expected) and np.isnan(value)
+
+
+@pytest.mark.parametrize("values", INFINITE_CASES)
+@pytest.mark.parametrize("q", [0.0, 0.1, 0.25, 0.75, 1.0])
+def test_quantile_with_infinities_matches_numpy(values, q):
+    array = np.array(values)
+    with np.errstate(all="ignore"):
+        expected = np.quantile(array, q)
+    value = quantile(array, q)[0]
+    if np.isnan(expected):
+        # np.quantile's interpolation turns any infinity into NaN, even at a
+        # whole position or between two equal infinities.
+        ordered = np.sort(array)
+        rank = q * (array.size - 1)
+        below = int(rank)
+        if rank == below or ordered[below] == ordered[below + 1]:
+            assert value == ordered[below]
+        else:
+            assert np.isnan(value)
+    else:
+        assert np.array_equal(value, expected, equal_nan=True)
+
+
+def test_median_with_nan_is_nan():
+    assert np.isnan(median(np.array([1.0, np.nan, np.inf]))[0])
+
+
+def test_uint64_above_int64_range(tmp_path):
+    path = str(tmp_path / "values.bin")
+    np.array([1, 2 ** 63 + 10, 5, 2 ** 64 - 1], dtype=np.uint64).tofile(path)
+    array = load_array(path, "uint64")
+
+    assert median(array)[0] == np.median(array)
+    assert median(array[:3])[0] == 5
+    for q in (0.0, 0.3, 0.75, 1.0):
+        assert quantile(array, q)[0] == np.quantile(array, q)
+
+
+def test_moments_of_large_integers():
+    # Nanosecond timestamps: the int64 sum wraps, the mean must not.
+    array = np.full(10, 1_700_000_000_000_000_000, dtype=np.int64)
+    result = moments(array)
+    assert result["sum"] == np.sum(array)
+    assert result["mean"] == np.mean(array)
+    assert result["var"] == np.var(array) == 0
+    assert np.array_equal(moments(array.reshape(5, 2), axis=0)["mean"], np.mean(array.reshape(5, 2), axis=0))
+
+
+def test_chunked_gather_matches_concatenated_array():
+    rng = np.random.default_rng(0)
+    parts = [rng.normal(size=(n, 2)) for n in (5, 0, 1, 7)]
+    chunked, full = ChunkedArray(parts), np.concatenate(parts)
+    rows = rng.integers(-len(full), len(full), 50)
+    mask = rng.random(len(full)) < 0.5
+
+    assert np.array_equal(chunked[rows], full[rows])
+    assert np.array_equal(chunked[rows, 1], full[rows, 1])
+    assert np.array_equal(chunked[mask], full[mask])
+    assert chunked[[]].shape == (0, 2)
+    with pytest.raises(IndexError):
+        chunked[[len(full)]]